@@ -0,0 +1,141 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from config import ASSET_DIR, ASSET_BUDGET, BUNDLE_FILE
+from utils import load_image
+
+MANIFEST = os.path.join(ASSET_DIR, "manifest.json")
+
+
+def read_manifest(path=MANIFEST):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception:
+        return []
+    jobs = []
+    for entry in manifest.get("images", []):
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        size = tuple(entry["size"]) if "size" in entry else None
+        jobs.append(("image", (entry["name"], entry.get("alpha", True), size)))
+    for name in manifest.get("sounds", []):
+        jobs.append(("sound", (name,)))
+    if manifest.get("atlas"):
+        jobs.append(("atlas", ()))
+    return jobs
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound):
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    freq, fmt, channels = init
+    return int(sound.get_length() * freq) * channels * (abs(fmt) // 8)
+
+
+class AssetManager:
+    def __init__(self, root=ASSET_DIR, budget=ASSET_BUDGET):
+        self.root = root
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bundle = None
+        self.pending = {}
+        self.lock = threading.RLock()
+
+    def open_bundle(self, path=BUNDLE_FILE):
+        from bundle import Bundle
+
+        with self.lock:
+            self.bundle = Bundle.open(path)
+        return self.bundle is not None
+
+    def _lookup(self, key, loader, measure):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            waiting = self.pending.get(key)
+            if waiting is None:
+                self.misses += 1
+                self.pending[key] = threading.Event()
+        if waiting is not None:
+            waiting.wait()
+            with self.lock:
+                self.hits += 1
+                return self.entries.get(key)
+        try:
+            value = loader()
+            size = measure(value) if value is not None else 0
+        except Exception:
+            value, size = None, 0
+        with self.lock:
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.resident += size
+            self._evict()
+            self.pending.pop(key).set()
+        return value
+
+    def _evict(self):
+        if self.budget is None:
+            return
+        while self.resident > self.budget and len(self.entries) > 1:
+            key, _ = self.entries.popitem(last=False)
+            self.resident -= self.sizes.pop(key)
+            self.evictions += 1
+
+    def _load_image(self, name, alpha, size):
+        if self.bundle:
+            img = self.bundle.image(name, alpha, size)
+            if img is not None:
+                return img
+        img = load_image(os.path.join(self.root, name), alpha)
+        if img is not None and size and img.get_size() != size:
+            img = pygame.transform.scale(img, size)
+        return img
+
+    def _load_sound(self, name):
+        if not pygame.mixer.get_init():
+            return None
+        if self.bundle:
+            sound = self.bundle.sound(name)
+            if sound is not None:
+                return sound
+        try:
+            return pygame.mixer.Sound(os.path.join(self.root, name))
+        except Exception:
+            return None
+
+    def image(self, name, alpha=True, size=None):
+        return self._lookup(("image", name, alpha, size), lambda: self._load_image(name, alpha, size), surface_bytes)
+
+    def sound(self, name):
+        return self._lookup(("sound", name), lambda: self._load_sound(name), sound_bytes)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resident": self.resident,
+            }
+
+
+assets = AssetManager()
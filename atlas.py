@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import argparse
+
+import pygame
+
+from config import ASSET_DIR
+from assets import assets
+
+SOURCE_DIR = os.path.join(ASSET_DIR, "SpaceShooterRedux", "PNG")
+ATLAS_DIR = os.path.join(ASSET_DIR, "atlas")
+INDEX_NAME = "index.json"
+
+
+def collect(source):
+    images = {}
+    for dirpath, _, filenames in os.walk(source):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(".png"):
+                continue
+            path = os.path.join(dirpath, filename)
+            name = os.path.splitext(os.path.relpath(path, source))[0].replace(os.sep, "/")
+            images[name] = pygame.image.load(path)
+    return images
+
+
+def pack(sizes, sheet_size=1024, padding=1):
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+    placements = {}
+    sheet = 0
+    x = y = shelf_h = 0
+    for name in order:
+        w, h = sizes[name]
+        w += padding
+        h += padding
+        if w > sheet_size or h > sheet_size:
+            raise ValueError(f"{name} ({w}x{h}) does not fit in a {sheet_size}px sheet")
+        if x + w > sheet_size:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        if y + h > sheet_size:
+            sheet += 1
+            x = y = shelf_h = 0
+        placements[name] = (sheet, x, y, w - padding, h - padding)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return placements, sheet + 1
+
+
+def build(source=SOURCE_DIR, out=ATLAS_DIR, sheet_size=1024, padding=1):
+    images = collect(source)
+    placements, count = pack({name: img.get_size() for name, img in images.items()}, sheet_size, padding)
+    used = [0] * count
+    for sheet, x, y, w, h in placements.values():
+        used[sheet] = max(used[sheet], y + h)
+    sheets = [pygame.Surface((sheet_size, height), pygame.SRCALPHA) for height in used]
+    for name, (sheet, x, y, w, h) in placements.items():
+        sheets[sheet].blit(images[name], (x, y))
+
+    os.makedirs(out, exist_ok=True)
+    files = []
+    for i, surface in enumerate(sheets):
+        filename = f"sheet_{i}.png"
+        pygame.image.save(surface, os.path.join(out, filename))
+        files.append(filename)
+    index = {"sheets": files, "sprites": {name: list(rect) for name, rect in sorted(placements.items())}}
+    with open(os.path.join(out, INDEX_NAME), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    return len(images), len(files)
+
+
+class Atlas:
+    def __init__(self, root=ATLAS_DIR):
+        self.root = root
+        self.sheets = None
+        self.rects = {}
+        self.cache = {}
+
+    def load(self):
+        if self.sheets is not None:
+            return bool(self.sheets)
+        self.sheets = []
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except Exception:
+            return False
+        rel = os.path.relpath(self.root, assets.root)
+        sheets = [assets.image(os.path.join(rel, filename)) for filename in index["sheets"]]
+        if any(sheet is None for sheet in sheets):
+            return False
+        self.sheets = sheets
+        self.rects = {name: tuple(rect) for name, rect in index["sprites"].items()}
+        return True
+
+    def get(self, name):
+        image = self.cache.get(name)
+        if image is not None:
+            return image
+        if not self.load() or name not in self.rects:
+            return None
+        sheet, x, y, w, h = self.rects[name]
+        image = self.sheets[sheet].subsurface((x, y, w, h))
+        self.cache[name] = image
+        return image
+
+
+atlas = Atlas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the SpaceShooterRedux PNGs into atlas sheets")
+    parser.add_argument("--source", default=SOURCE_DIR)
+    parser.add_argument("--out", default=ATLAS_DIR)
+    parser.add_argument("--size", type=int, default=1024, help="sheet width and maximum height in pixels")
+    parser.add_argument("--padding", type=int, default=1)
+    args = parser.parse_args()
+    try:
+        count, sheets = build(args.source, args.out, args.size, args.padding)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+    print(f"packed {count} sprites into {sheets} sheet(s) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,30 @@
 import os
-import math
-from array import array
-import random
+import time
 import pygame
+import numpy as np
 
-from config import ASSET_DIR, DEFAULT_SFX_VOLUME, DEFAULT_MUSIC_VOLUME
-from utils import make_beep, make_melody
+from config import ASSET_DIR, DEFAULT_SFX_VOLUME, DEFAULT_MUSIC_VOLUME, SFX_VOICES
+from utils import make_beep, cached_pcm, wave
+from assets import assets
+
+SFX = {
+    "pew": (0, 0.05),
+    "boom": (1, 0.03),
+    "power": (2, 0.0),
+    "boss": (3, 0.0),
+    "gameover": (3, 0.0),
+}
+ENGINE_CHANNEL = 0
+BGM_CHANNEL = 1
+RESERVED_CHANNELS = 2
+STREAM_BLOCK = 0.25
 
 
 def load_sound(name):
-    path = os.path.join(ASSET_DIR, name)
-    try:
-        sfx = pygame.mixer.Sound(path)
-        return sfx
-    except Exception:
+    sound = assets.sound(name)
+    if sound is None or sound.get_length() <= 0:
         return None
+    return sound
 
 
 def load_music(name):
@@ -29,18 +39,15 @@ def load_music(name):
 
 
 def make_engine_loop(freq=70, duration=0.6, volume=0.22, sample_rate=22050):
-    n = int(duration * sample_rate)
-    buf = array("h")
-    amp = int(32767 * volume)
-    for i in range(n):
-        t = i / sample_rate
-        wobble = 1.0 + 0.15 * math.sin(2 * math.pi * 2.2 * t)
-        val = math.sin(2 * math.pi * freq * t) * 0.65
-        val += math.sin(2 * math.pi * (freq * 2.1) * t) * 0.25
-        val += (random.random() * 2 - 1) * 0.08
-        val *= wobble
-        buf.append(int(val * amp))
-    return pygame.mixer.Sound(buffer=buf)
+    def build():
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        wobble = 1.0 + 0.15 * np.sin(2 * np.pi * 2.2 * t)
+        val = np.sin(2 * np.pi * freq * t) * 0.65
+        val += np.sin(2 * np.pi * (freq * 2.1) * t) * 0.25
+        val += np.random.default_rng(0).uniform(-1.0, 1.0, len(t)) * 0.08
+        return val * wobble * int(32767 * volume)
+
+    return pygame.mixer.Sound(buffer=cached_pcm("engine", [freq, duration, volume, sample_rate], build))
 
 
 def make_gun_burst():
@@ -51,6 +58,53 @@ def make_explosion():
     return make_beep(120, 0.22, 0.38, waveform="triangle")
 
 
+class MusicStream:
+    def __init__(self, channel, sequence, bpm=120, volume=0.25, waveform="sine", sample_rate=22050, block=STREAM_BLOCK):
+        beat = 60 / bpm
+        lengths = np.array([int(beat * beats * sample_rate) for _, beats in sequence])
+        self.channel = channel
+        self.freqs = np.array([freq for freq, _ in sequence], dtype=float)
+        self.ends = np.cumsum(lengths)
+        self.starts = self.ends - lengths
+        self.total = int(self.ends[-1])
+        self.amp = int(32767 * volume)
+        self.waveform = "square" if waveform == "square" else "sine"
+        self.sample_rate = sample_rate
+        self.block = max(1, int(block * sample_rate))
+        self.volume = 1.0
+        self.pos = 0
+
+    def render(self):
+        idx = (self.pos + np.arange(self.block)) % self.total
+        note = np.searchsorted(self.ends, idx, side="right")
+        freq = self.freqs[note]
+        val = wave(freq, (idx - self.starts[note]) / self.sample_rate, self.waveform)
+        val[freq == 0] = 0.0
+        self.pos = (self.pos + self.block) % self.total
+        sound = pygame.mixer.Sound(buffer=(val * self.amp).astype(np.int16))
+        sound.set_volume(self.volume)
+        return sound
+
+    def start(self):
+        self.channel.play(self.render())
+        self.channel.queue(self.render())
+
+    def pump(self):
+        if not self.channel.get_busy():
+            self.start()
+        elif self.channel.get_queue() is None:
+            self.channel.queue(self.render())
+
+    def set_volume(self, value):
+        self.volume = value
+        for sound in (self.channel.get_sound(), self.channel.get_queue()):
+            if sound:
+                sound.set_volume(value)
+
+    def stop(self):
+        self.channel.stop()
+
+
 class AudioManager:
     def __init__(self, audio_ok):
         self.audio_ok = audio_ok
@@ -62,7 +116,14 @@ class AudioManager:
         self.sfx_boss = None
         self.sfx_gameover = None
         self.engine_loop = None
-        self.bgm_sound = None
+        self.music = None
+        self.sounds = {}
+        self.voices = []
+        self.voice_priority = []
+        self.voice_started = []
+        self.last_played = {}
+        self.dropped = 0
+        self.stolen = 0
 
     def init(self):
         if not self.audio_ok:
@@ -74,8 +135,45 @@ class AudioManager:
         self.sfx_boss = load_sound("boss_enter.ogg") or make_beep(180, 0.45, 0.30, sample_rate=sr)
         self.sfx_gameover = load_sound("gameover.ogg") or make_beep(110, 0.60, 0.30, sample_rate=sr)
         self.engine_loop = load_sound("engine_loop.ogg")
+        self.sounds = {
+            "pew": self.sfx_pew,
+            "boom": self.sfx_boom,
+            "power": self.sfx_power,
+            "boss": self.sfx_boss,
+            "gameover": self.sfx_gameover,
+        }
+        pygame.mixer.set_num_channels(RESERVED_CHANNELS + SFX_VOICES)
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self.voices = [pygame.mixer.Channel(RESERVED_CHANNELS + i) for i in range(SFX_VOICES)]
+        self.voice_priority = [0] * SFX_VOICES
+        self.voice_started = [0.0] * SFX_VOICES
         self.apply_volumes()
 
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None or not self.voices:
+            return False
+        priority, interval = SFX[name]
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -interval) < interval:
+            return False
+        slot = None
+        for i, voice in enumerate(self.voices):
+            if not voice.get_busy():
+                slot = i
+                break
+        if slot is None:
+            slot = min(range(len(self.voices)), key=lambda i: (self.voice_priority[i], self.voice_started[i]))
+            if self.voice_priority[slot] > priority:
+                self.dropped += 1
+                return False
+            self.stolen += 1
+        self.voices[slot].play(sound)
+        self.voice_priority[slot] = priority
+        self.voice_started[slot] = now
+        self.last_played[name] = now
+        return True
+
     def apply_volumes(self):
         for sfx in (self.sfx_pew, self.sfx_boom, self.sfx_power, self.sfx_boss, self.sfx_gameover, self.engine_loop):
             if sfx:
@@ -86,7 +184,7 @@ class AudioManager:
         if self.audio_ok and load_music(track):
             pygame.mixer.music.set_volume(self.music_volume)
             pygame.mixer.music.play(-1)
-            self.bgm_sound = None
+            self.music = None
             return
         if not self.audio_ok:
             return
@@ -96,21 +194,26 @@ class AudioManager:
             seq = [(330, 1), (392, 0.5), (440, 0.5), (392, 1), (330, 0.5), (0, 0.5)]
         else:
             seq = [(262, 1), (330, 0.5), (392, 0.5), (523, 1), (392, 0.5), (0, 0.5)]
-        self.bgm_sound = make_melody(seq, bpm=135, volume=0.20, waveform="square")
-        self.bgm_sound.set_volume(self.music_volume)
-        self.bgm_sound.play(-1)
+        sr = pygame.mixer.get_init()[0]
+        self.music = MusicStream(pygame.mixer.Channel(BGM_CHANNEL), seq, bpm=135, volume=0.20, waveform="square", sample_rate=sr)
+        self.music.set_volume(self.music_volume)
+        self.music.start()
+
+    def update(self):
+        if self.music:
+            self.music.pump()
 
     def stop_bgm(self):
         if self.audio_ok:
             pygame.mixer.music.stop()
-        if self.bgm_sound:
-            self.bgm_sound.stop()
-            self.bgm_sound = None
+        if self.music:
+            self.music.stop()
+            self.music = None
 
     def start_engine(self):
         if self.engine_loop:
             self.engine_loop.set_volume(self.sfx_volume)
-            self.engine_loop.play(-1)
+            pygame.mixer.Channel(ENGINE_CHANNEL).play(self.engine_loop, -1)
 
     def stop_engine(self):
         if self.engine_loop:
@@ -122,6 +225,6 @@ class AudioManager:
 
     def set_music_volume(self, value):
         self.music_volume = max(0.0, min(1.0, value))
-        if self.bgm_sound:
-            self.bgm_sound.set_volume(self.music_volume)
+        if self.music:
+            self.music.set_volume(self.music_volume)
         pygame.mixer.music.set_volume(self.music_volume)
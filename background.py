@@ -1,71 +1,99 @@
 import random
-import os
 import pygame
 
 from config import WIDTH, HEIGHT
-from config import ASSET_DIR
+from assets import assets
+
+LEVEL_COLORS = {1: (12, 12, 24), 2: (10, 10, 26)}
+DEFAULT_COLOR = (8, 8, 22)
+COLORKEY = (255, 0, 255)
+
+
+def display_format(strip, colorkey=None):
+    if colorkey:
+        strip.set_colorkey(colorkey, pygame.RLEACCEL)
+    if pygame.display.get_surface():
+        strip = strip.convert()
+    return strip
+
+
+def circle_strip(height, shapes):
+    strip = pygame.Surface((WIDTH, height))
+    strip.fill(COLORKEY)
+    for color, x, y, r in shapes:
+        for wrap in (-height, 0, height):
+            pygame.draw.circle(strip, color, (x, y + wrap), r)
+    return display_format(strip, COLORKEY)
+
+
+class Layer:
+    def __init__(self, build, speed, wrap=None):
+        self.build = build
+        self.speed = speed
+        self.wrap = wrap
+        self.strip = None
+
+    def draw(self, surface, time):
+        if self.strip is None:
+            self.strip = self.build()
+        h = self.strip.get_height()
+        y = int(time * self.speed % (self.wrap or h))
+        surface.blit(self.strip, (0, y))
+        if y > 0:
+            surface.blit(self.strip, (0, y - h))
 
 
 class Background:
     def __init__(self):
-        self.bg_image = None
-        bg_path = os.path.join(ASSET_DIR, "background.png")
-        if os.path.exists(bg_path):
-            try:
-                img = pygame.image.load(bg_path).convert()
-                if img.get_width() != WIDTH or img.get_height() != HEIGHT:
-                    img = pygame.transform.scale(img, (WIDTH, HEIGHT))
-                self.bg_image = img
-            except Exception:
-                self.bg_image = None
-        self.wave_offset = 0
-        self.clouds = [
-            [random.randint(0, WIDTH), random.randint(0, HEIGHT), random.randint(40, 90), random.uniform(10, 30)]
-            for _ in range(6)
-        ]
-        self.islands = [
-            [random.randint(40, WIDTH - 60), random.randint(-HEIGHT, HEIGHT), random.randint(30, 80)]
-            for _ in range(5)
+        self.bg_image = assets.image("background.png", alpha=False, size=(WIDTH, HEIGHT))
+        self.time = 0.0
+        self.scrolling = True
+        self.level = None
+        if self.bg_image:
+            self.layers = [Layer(lambda: self.bg_image, 320, 80)]
+            return
+        self.layers = [
+            Layer(self.build_waves, 80, 40),
+            Layer(lambda: self.build_islands(HEIGHT * 2, 5), 40),
+            Layer(lambda: self.build_clouds(HEIGHT * 2, 5, 40, 70), 12),
+            Layer(lambda: self.build_clouds(HEIGHT * 2, 5, 60, 90), 26),
         ]
 
+    def build_waves(self):
+        strip = pygame.Surface((WIDTH, HEIGHT))
+        strip.fill(LEVEL_COLORS.get(self.level, DEFAULT_COLOR))
+        for y in range(0, HEIGHT, 20):
+            offset = (y % 40) // 5
+            pygame.draw.line(strip, (40, 60, 120), (0, y + offset), (WIDTH, y + offset), 1)
+        return display_format(strip)
+
+    def build_islands(self, height, count):
+        shapes = []
+        for _ in range(count):
+            x, y, r = random.randint(40, WIDTH - 60), random.randint(0, height), random.randint(30, 80)
+            shapes.append(((30, 40, 80), x, y, r))
+            shapes.append(((50, 60, 110), x + int(r * 0.2), int(y - r * 0.1), int(r * 0.7)))
+        return circle_strip(height, shapes)
+
+    def build_clouds(self, height, count, min_r, max_r):
+        shapes = []
+        for _ in range(count):
+            x, y, r = random.randint(0, WIDTH), random.randint(0, height), random.randint(min_r, max_r)
+            shapes.append(((140, 150, 190), x, y, int(r * 0.7)))
+            shapes.append(((170, 180, 210), int(x + r * 0.5), y, int(r * 0.55)))
+        return circle_strip(height, shapes)
+
+    def moving(self):
+        return self.scrolling and any(layer.speed for layer in self.layers)
+
     def update(self, dt):
-        self.wave_offset = (self.wave_offset + 80 * dt) % 20
-        for cloud in self.clouds:
-            cloud[1] += cloud[3] * dt
-            if cloud[1] > HEIGHT + 80:
-                cloud[0] = random.randint(0, WIDTH)
-                cloud[1] = -80
-        for island in self.islands:
-            island[1] += 40 * dt
-            if island[1] > HEIGHT + 60:
-                island[0] = random.randint(40, WIDTH - 60)
-                island[1] = random.randint(-HEIGHT, -40)
+        if self.scrolling:
+            self.time += dt
 
     def draw(self, surface, level):
-        if self.bg_image:
-            img_h = self.bg_image.get_height()
-            scroll = int(self.wave_offset * 4) % img_h
-            for y in (-img_h + scroll, scroll, img_h + scroll):
-                surface.blit(self.bg_image, (0, y))
-        else:
-            if level == 1:
-                surface.fill((12, 12, 24))
-            elif level == 2:
-                surface.fill((10, 10, 26))
-            else:
-                surface.fill((8, 8, 22))
-
-        if not self.bg_image:
-            for y in range(-20, HEIGHT + 20, 20):
-                offset = int(self.wave_offset + (y % 40) * 0.2)
-                pygame.draw.line(surface, (40, 60, 120), (0, y + offset), (WIDTH, y + offset), 1)
-
-        if not self.bg_image:
-            for x, y, r in self.islands:
-                pygame.draw.circle(surface, (30, 40, 80), (x, int(y)), r)
-                pygame.draw.circle(surface, (50, 60, 110), (x + int(r * 0.2), int(y - r * 0.1)), int(r * 0.7))
-
-        if not self.bg_image:
-            for x, y, r, _ in self.clouds:
-                pygame.draw.circle(surface, (140, 150, 190), (int(x), int(y)), int(r * 0.7))
-                pygame.draw.circle(surface, (170, 180, 210), (int(x + r * 0.5), int(y)), int(r * 0.55))
+        if level != self.level:
+            self.level = level
+            if not self.bg_image:
+                self.layers[0].strip = None
+        for layer in self.layers:
+            layer.draw(surface, self.time)
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import argparse
+import platform
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from config import WIDTH
+from game import Game
+from headless import KeyState
+
+SCENARIOS = {}
+
+
+def scenario(name, description):
+    def register(setup):
+        SCENARIOS[name] = (description, setup)
+        return setup
+
+    return register
+
+
+def _hold_player(game):
+    game.player.invuln = 10**9
+
+
+@scenario("zig_200", "200 enemies in zig formation")
+def _zig_200(game):
+    game.reset_game(1)
+    _hold_player(game)
+    for i in range(200):
+        x = 80 + (i % 10) * (WIDTH - 160) // 9
+        y = -60 - (i // 10) * 30
+        enemy = game.make_enemy(x, y, "basic")
+        enemy.set_pattern("zig", start_x=x, amp=140, freq=2.2, phase=i * 0.6)
+        game.enemies.add(enemy)
+
+
+@scenario("boss3_phase2", "level 3 boss phase 2 with full enemy fire")
+def _boss3_phase2(game):
+    game.reset_game(3, boss=True)
+    _hold_player(game)
+    game.spawn_boss()
+    boss = game.boss_group.sprite
+    boss.entering = False
+    boss.rect.top = 40
+    boss.hp = boss.max_hp * 0.4
+    for i in range(24):
+        game.enemies.add(game.make_enemy(60 + i * 30, 80 + (i % 3) * 40, "shielded"))
+
+    def tick(frame):
+        xs = np.linspace(40, WIDTH - 40, 12)
+        game.enemy_bullets.spawn(xs, boss.rect.bottom + 10, vx=(xs - WIDTH / 2) * 0.4, vy=260, damage=2)
+
+    return tick
+
+
+@scenario("explosions_10", "10 simultaneous explosions")
+def _explosions_10(game):
+    game.reset_game(1)
+    _hold_player(game)
+
+    def tick(frame):
+        if not len(game.particles):
+            for i in range(10):
+                game.explode(80 + i * 70, 200 + (i % 3) * 80, (255, 120, 120))
+
+    return tick
+
+
+@scenario("bullets_2000", "2000 enemy bullets on screen")
+def _bullets_2000(game):
+    game.reset_game(1)
+    _hold_player(game)
+
+    def tick(frame):
+        missing = 2000 - len(game.enemy_bullets)
+        if missing > 0:
+            rng = np.random.default_rng(frame)
+            game.enemy_bullets.spawn(rng.uniform(0, WIDTH, missing), rng.uniform(-40, 0, missing), vy=240)
+
+    return tick
+
+
+def summarize(samples):
+    values = np.array(samples) * 1000
+    return {
+        "mean": float(values.mean()),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+def run_scenario(game, name, frames, warmup):
+    _, setup = SCENARIOS[name]
+    tick = setup(game)
+    keys = KeyState()
+    stages = {}
+    game.timer.end_frame()
+    for frame in range(warmup + frames):
+        if tick:
+            tick(frame)
+        pressed = [pygame.K_SPACE] if frame % 9 == 0 else []
+        game.step(keys, pressed)
+        game.render()
+        record = game.timer.end_frame()
+        if frame < warmup:
+            continue
+        for stage, seconds in record.items():
+            stages.setdefault(stage, []).append(seconds)
+    for samples in stages.values():
+        samples.extend([0.0] * (frames - len(samples)))
+    return {"frames": frames, "stages": {stage: summarize(samples) for stage, samples in stages.items()}}
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    failures = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for stage, stats in result["stages"].items():
+            ref = base["stages"].get(stage)
+            if not ref:
+                continue
+            limit = max(ref["p95"] * (1 + tolerance), ref["p95"] + floor_ms)
+            if stats["p95"] > limit:
+                failures.append(f"{name}/{stage}: p95 {stats['p95']:.3f}ms > {limit:.3f}ms (baseline {ref['p95']:.3f}ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Galaxy Fury macro benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", metavar="PATH", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH", help="fail if any stage p95 regresses against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95 regression")
+    parser.add_argument("--floor-ms", type=float, default=0.05, help="ignore p95 regressions smaller than this")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    game = Game(seed=args.seed)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "video_driver": pygame.display.get_driver(),
+            "frames": args.frames,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        results["scenarios"][name] = run_scenario(game, name, args.frames, args.warmup)
+        results["scenarios"][name]["description"] = SCENARIOS[name][0]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.tolerance, args.floor_ms)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
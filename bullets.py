@@ -0,0 +1,130 @@
+import numpy as np
+import pygame
+
+from config import WIDTH, HEIGHT
+
+
+class BulletField:
+    FIELDS = ("x", "y", "px", "py", "vx", "vy", "damage")
+
+    def __init__(self, image=None, color=(255, 255, 255), capacity=256):
+        if image is None:
+            image = pygame.Surface((4, 12))
+            image.fill(color)
+        self.image = image
+        self.w, self.h = image.get_size()
+        self.half_w = self.w // 2
+        self.half_h = self.h // 2
+        self.count = 0
+        self.capacity = 0
+        self.hits = 0
+        self.misses = 0
+        self._grow(capacity)
+
+    def _grow(self, needed):
+        capacity = max(needed, self.capacity * 2)
+        for name in self.FIELDS:
+            arr = np.zeros(capacity)
+            if self.capacity:
+                arr[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, arr)
+        alive = np.zeros(capacity, dtype=bool)
+        if self.capacity:
+            alive[: self.count] = self.alive[: self.count]
+        self.alive = alive
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[: self.count]))
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, damage=1):
+        x, y, vx, vy, damage = np.broadcast_arrays(*(np.atleast_1d(v) for v in (x, y, vx, vy, damage)))
+        n = x.size
+        overflow = max(0, self.count + n - self.capacity)
+        if overflow:
+            self.misses += overflow
+            self._grow(self.count + n)
+        self.hits += n - overflow
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.px[s] = x
+        self.y[s] = self.py[s] = y
+        self.vx[s] = vx
+        self.vy[s] = vy
+        self.damage[s] = damage
+        self.alive[s] = True
+        self.count += n
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        x += np.trunc(self.vx[:n] * dt)
+        y += np.trunc(self.vy[:n] * dt)
+        top = y - self.half_h
+        left = x - self.half_w
+        keep = self.alive[:n] & (top + self.h >= 0) & (top <= HEIGHT) & (left + self.w >= 0) & (left <= WIDTH)
+        self._compact(keep)
+
+    def _compact(self, keep):
+        n = self.count
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[:n][keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.count = k
+
+    def collide(self, rect):
+        n = self.count
+        left = self.x[:n] - self.half_w
+        top = self.y[:n] - self.half_h
+        hit = (
+            self.alive[:n]
+            & (left < rect.right)
+            & (left + self.w > rect.left)
+            & (top < rect.bottom)
+            & (top + self.h > rect.top)
+        )
+        return np.flatnonzero(hit)
+
+    def rects(self):
+        n = self.count
+        idx = np.flatnonzero(self.alive[:n])
+        lefts = (self.x[idx] - self.half_w).astype(np.int32).tolist()
+        tops = (self.y[idx] - self.half_h).astype(np.int32).tolist()
+        w, h = self.w, self.h
+        return [(i, pygame.Rect(left, top, w, h)) for i, left, top in zip(idx.tolist(), lefts, tops)]
+
+    def total_damage(self, idx):
+        return float(self.damage[idx].sum())
+
+    def position(self, i):
+        return int(self.x[i]), int(self.y[i])
+
+    def kill(self, idx):
+        self.alive[idx] = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "free": self.capacity - self.count}
+
+    def empty(self):
+        self.count = 0
+
+    def draw(self, surface, alpha=1.0, dirty=False):
+        n = self.count
+        if not n:
+            return []
+        alive = self.alive[:n]
+        px = self.px[:n][alive]
+        py = self.py[:n][alive]
+        xs = (px + (self.x[:n][alive] - px) * alpha - self.half_w).astype(np.int32).tolist()
+        ys = (py + (self.y[:n][alive] - py) * alpha - self.half_h).astype(np.int32).tolist()
+        image = self.image
+        return surface.blits([(image, pos) for pos in zip(xs, ys)], dirty)
@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import mmap
+import struct
+
+import pygame
+
+from config import ASSET_DIR, BUNDLE_FILE, MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
+
+MAGIC = b"GFAB"
+VERSION = 2
+HEADER = struct.Struct("<4sHI")
+ALIGN = 16
+
+
+def source_stamp(name):
+    try:
+        st = os.stat(os.path.join(ASSET_DIR, name))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class Bundle:
+    def __init__(self, path, file, data, index, base):
+        self.path = path
+        self.file = file
+        self.data = data
+        self.view = memoryview(data)
+        self.images = index["images"]
+        self.sounds = index["sounds"]
+        self.mixer = tuple(index["mixer"])
+        self.base = base
+
+    @classmethod
+    def open(cls, path=BUNDLE_FILE):
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, index_len = HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+            index = json.loads(bytes(data[HEADER.size : HEADER.size + index_len]).decode("utf-8"))
+        except Exception:
+            f.close()
+            return None
+        end = HEADER.size + index_len
+        return cls(path, f, data, index, end + (-end % ALIGN))
+
+    def _slice(self, entry):
+        start = self.base + entry["offset"]
+        return self.view[start : start + entry["length"]]
+
+    def _fresh(self, name, entry):
+        stamp = source_stamp(name)
+        return stamp is None or stamp == entry["source"]
+
+    def image(self, name, alpha=True, size=None):
+        entry = self.images.get(name)
+        if entry is None or entry["alpha"] != alpha or not self._fresh(name, entry):
+            return None
+        if size and tuple(entry["size"]) != tuple(size):
+            return None
+        surface = pygame.image.frombuffer(self._slice(entry), tuple(entry["size"]), "BGRA")
+        if not alpha and pygame.display.get_surface():
+            surface = surface.convert()
+        return surface
+
+    def sound(self, name):
+        entry = self.sounds.get(name)
+        if entry is None or pygame.mixer.get_init() != self.mixer or not self._fresh(name, entry):
+            return None
+        return pygame.mixer.Sound(buffer=self._slice(entry))
+
+
+def build(manifest_path, out=BUNDLE_FILE):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    blobs = []
+    index = {"images": {}, "sounds": {}, "mixer": list(pygame.mixer.get_init())}
+    offset = 0
+
+    def add(table, name, payload, **meta):
+        nonlocal offset
+        table[name] = dict(meta, offset=offset, length=len(payload))
+        pad = -len(payload) % ALIGN
+        blobs.append(payload + b"\0" * pad)
+        offset += len(payload) + pad
+
+    for entry in manifest.get("images", []):
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        path = os.path.join(ASSET_DIR, entry["name"])
+        try:
+            img = pygame.image.load(path)
+        except Exception:
+            continue
+        if "size" in entry and img.get_size() != tuple(entry["size"]):
+            img = pygame.transform.scale(img, tuple(entry["size"]))
+        add(index["images"], entry["name"], pygame.image.tobytes(img, "BGRA"), alpha=entry.get("alpha", True), size=list(img.get_size()), source=source_stamp(entry["name"]))
+
+    for name in manifest.get("sounds", []):
+        try:
+            sound = pygame.mixer.Sound(os.path.join(ASSET_DIR, name))
+        except Exception:
+            continue
+        add(index["sounds"], name, sound.get_raw(), source=source_stamp(name))
+
+    encoded = json.dumps(index).encode("utf-8")
+    end = HEADER.size + len(encoded)
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (-end % ALIGN))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out)
+    return len(index["images"]), len(index["sounds"]), end + (-end % ALIGN) + offset
+
+
+def main():
+    from assets import MANIFEST
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    try:
+        pygame.mixer.init()
+    except pygame.error as exc:
+        print(f"mixer unavailable: {exc}", file=sys.stderr)
+        sys.exit(1)
+    images, sounds, size = build(sys.argv[1] if len(sys.argv) > 1 else MANIFEST)
+    print(f"bundled {images} images and {sounds} sounds into {BUNDLE_FILE} ({size // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
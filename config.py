@@ -2,11 +2,26 @@ import os
 
 WIDTH, HEIGHT = 800, 600
 FPS = 60
+IDLE_FPS = 20
+SIM_HZ = 60
+SIM_DT = 1 / SIM_HZ
+MAX_FRAME_TIME = 0.25
 TITLE = "Galaxy Fury"
 
 BASE_DIR = os.path.dirname(__file__)
 ASSET_DIR = os.path.join(BASE_DIR, "assets")
 HISCORE_FILE = os.path.join(BASE_DIR, "highscore.txt")
+FONT_CACHE_FILE = os.path.join(BASE_DIR, ".font_cache.json")
+SYNTH_CACHE_DIR = os.path.join(BASE_DIR, ".synth_cache")
+FONT_NAMES = "consolas,dejavusansmono,liberationmono,menlo,couriernew"
+ASSET_BUDGET = None
+BUNDLE_FILE = os.path.join(ASSET_DIR, "bundle.gfab")
+
+MIXER_FREQUENCY = 22050
+MIXER_SIZE = -16
+MIXER_CHANNELS = 1
+MIXER_BUFFER = 512
+SFX_VOICES = 12
 
 DEFAULT_SFX_VOLUME = 0.45
 DEFAULT_MUSIC_VOLUME = 0.35
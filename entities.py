@@ -1,88 +1,107 @@
 import math
 import random
-import os
 import pygame
 
-from config import WIDTH, HEIGHT, PLAYER_BULLET_COLOR, ASSET_DIR
+from config import WIDTH, HEIGHT
 from utils import clamp
+from assets import assets
 from sprites import SpriteFactory
+from pool import PooledSprite
+from atlas import atlas
+from rotation import rotations
 
+METEORS = ("meteorBrown_big1", "meteorBrown_big2", "meteorBrown_big3", "meteorBrown_big4", "meteorBrown_med1", "meteorBrown_med3")
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed=-520, color=PLAYER_BULLET_COLOR, damage=1, vx=0, vy=None, image=None):
-        super().__init__()
-        if image is not None:
-            self.image = image
-        else:
-            self.image = pygame.Surface((4, 12))
-            self.image.fill(color)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = speed
-        self.damage = damage
-        self.vx = vx
-        self.vy = vy
-
-    def update(self, dt):
-        if self.vy is None:
-            self.rect.y += int(self.speed * dt)
-        else:
-            self.rect.x += int(self.vx * dt)
-            self.rect.y += int(self.vy * dt)
-        if self.rect.bottom < 0 or self.rect.top > HEIGHT:
-            self.kill()
 
+class Asteroid(PooledSprite):
+    MIN_SIZE = 20
+    MAX_SIZE = 40
+    _images = {}
+    _frames = {}
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color, lifespan=0.6):
-        super().__init__()
-        self.image = pygame.Surface((3, 3), pygame.SRCALPHA)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.vx = random.uniform(-90, 90)
-        self.vy = random.uniform(-140, 140)
-        self.lifespan = lifespan
-
-    def update(self, dt):
-        self.lifespan -= dt
-        self.rect.x += int(self.vx * dt)
-        self.rect.y += int(self.vy * dt)
-        if self.lifespan <= 0:
-            self.kill()
-
-
-class Asteroid(pygame.sprite.Sprite):
-    def __init__(self, x, y, size=26):
+    def __init__(self, x, y, size=26, rng=random, render_rng=None):
         super().__init__()
+        self.reset(x, y, size, rng, render_rng)
+
+    @classmethod
+    def _image_for(cls, size):
+        image = cls._images.get(size)
+        if image is None:
+            image = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(image, (110, 85, 60), (size // 2, size // 2), size // 2)
+            pygame.draw.circle(image, (90, 70, 50), (size // 3, size // 3), size // 6)
+            cls._images[size] = image
+        return image
+
+    @classmethod
+    def _frames_for(cls, size):
+        frames = cls._frames.get(size)
+        if frames is None:
+            name = METEORS[size % len(METEORS)]
+            image = atlas.get(f"Meteors/{name}")
+            if image is None:
+                image = assets.image(f"SpaceShooterRedux/PNG/Meteors/{name}.png")
+            if image is None:
+                frames = [cls._image_for(size)]
+            else:
+                w, h = image.get_size()
+                scale = size / max(w, h)
+                image = pygame.transform.smoothscale(image, (max(1, round(w * scale)), max(1, round(h * scale))))
+                canvas = math.ceil(size * math.sqrt(2))
+                frames = rotations.frames(("meteor", name, size), image, (canvas, canvas))
+            cls._frames[size] = frames
+        return frames
+
+    @classmethod
+    def prebuild(cls):
+        for size in range(cls.MIN_SIZE, cls.MAX_SIZE + 1):
+            cls._frames_for(size)
+
+    def reset(self, x, y, size=26, rng=random, render_rng=None):
+        render_rng = render_rng or rng
         self.size = size
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (110, 85, 60), (size // 2, size // 2), size // 2)
-        pygame.draw.circle(self.image, (90, 70, 50), (size // 3, size // 3), size // 6)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = random.randint(90, 150)
-        self.drift = random.randint(-40, 40)
+        self.frames = self._frames_for(size)
+        self.image = self.frames[0]
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (x, y)
+        self.speed = rng.randint(90, 150)
+        self.drift = rng.randint(-40, 40)
+        self.angle = render_rng.uniform(0, 360)
+        self.spin = render_rng.uniform(-150, 150)
 
     def update(self, dt):
+        self.angle = (self.angle + self.spin * dt) % 360
+        self.image = self.frames[int(self.angle * len(self.frames) / 360) % len(self.frames)]
         self.rect.y += int(self.speed * dt)
         self.rect.x += int(self.drift * dt)
         if self.rect.top > HEIGHT + 40:
             self.kill()
 
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(PooledSprite):
     TYPES = ["speed", "triple", "shield"]
+    _icons = {}
 
     def __init__(self, x, y, ptype):
         super().__init__()
-        self.ptype = ptype
-        png_path = os.path.join(ASSET_DIR, f"powerup_{ptype}.png")
-        if os.path.exists(png_path):
-            try:
-                self.image = pygame.image.load(png_path).convert_alpha()
-            except Exception:
-                self.image = pygame.Surface((20, 20), pygame.SRCALPHA)
-        else:
-            self.image = pygame.Surface((20, 20), pygame.SRCALPHA)
-        if self.image.get_width() == 20:
+        self.reset(x, y, ptype)
+
+    @classmethod
+    def _icon_for(cls, ptype):
+        icon = cls._icons.get(ptype)
+        if icon is None:
+            icon = cls._make_icon(ptype)
+            cls._icons[ptype] = icon
+        return icon
+
+    @staticmethod
+    def _make_icon(ptype):
+        image = assets.image(f"powerup_{ptype}.png")
+        if image is None:
+            image = pygame.Surface((20, 20), pygame.SRCALPHA)
+        elif image.get_width() == 20:
+            image = image.copy()
+        if image.get_width() == 20:
             color = (255, 215, 0)
             if ptype == "speed":
                 color = (255, 140, 0)
@@ -90,15 +109,20 @@ class PowerUp(pygame.sprite.Sprite):
                 color = (100, 200, 255)
             elif ptype == "shield":
                 color = (120, 255, 120)
-            pygame.draw.circle(self.image, color, (10, 10), 9)
-            pygame.draw.circle(self.image, (30, 30, 30), (10, 10), 9, 2)
+            pygame.draw.circle(image, color, (10, 10), 9)
+            pygame.draw.circle(image, (30, 30, 30), (10, 10), 9, 2)
             if ptype == "speed":
-                pygame.draw.polygon(self.image, (30, 30, 30), [(7, 6), (14, 10), (7, 14)])
+                pygame.draw.polygon(image, (30, 30, 30), [(7, 6), (14, 10), (7, 14)])
             elif ptype == "triple":
                 for dx in (-4, 0, 4):
-                    pygame.draw.line(self.image, (30, 30, 30), (10 + dx, 5), (10 + dx, 15), 2)
+                    pygame.draw.line(image, (30, 30, 30), (10 + dx, 5), (10 + dx, 15), 2)
             elif ptype == "shield":
-                pygame.draw.rect(self.image, (30, 30, 30), (7, 6, 6, 10), 2)
+                pygame.draw.rect(image, (30, 30, 30), (7, 6, 6, 10), 2)
+        return image
+
+    def reset(self, x, y, ptype):
+        self.ptype = ptype
+        self.image = self._icon_for(ptype)
         self.rect = self.image.get_rect(center=(x, y))
         self.speed = 160
 
@@ -156,92 +180,42 @@ class Player(pygame.sprite.Sprite):
         return True
 
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, etype, level):
+class Enemy(PooledSprite):
+    def __init__(self, x, y, etype, level, rng=random):
         super().__init__()
+        self.etype = None
+        self.reset(x, y, etype, level, rng)
+
+    def reset(self, x, y, etype, level, rng=random):
+        if etype != self.etype:
+            self.image = SpriteFactory.enemy_sprite(etype)
         self.etype = etype
         self.level = level
         self.hp = 1
         self.speed = 95 + level * 8
-        self.zig_phase = random.uniform(0, math.tau)
+        self.zig_phase = rng.uniform(0, math.tau)
         self.kamikaze = False
         self.score_value = 10
 
         if etype == "basic":
-            self.image = SpriteFactory.enemy_sprite("basic")
             self.hp = 1
             self.score_value = 10
         elif etype == "kamikaze":
-            self.image = SpriteFactory.enemy_sprite("kamikaze")
             self.hp = 1
             self.kamikaze = True
             self.score_value = 20
         elif etype == "shielded":
-            self.image = SpriteFactory.enemy_sprite("shielded")
             self.hp = 3
             self.score_value = 20
 
         self.rect = self.image.get_rect(center=(x, y))
-        self.dive_target = None
         self.pattern = None
         self.pattern_data = {}
-        self.age = 0.0
 
     def set_pattern(self, pattern, **kwargs):
         self.pattern = pattern
         self.pattern_data = kwargs
 
-    def update(self, dt, player=None):
-        self.age += dt
-        if self.etype == "kamikaze" and player:
-            dx = player.rect.centerx - self.rect.centerx
-            dy = player.rect.centery - self.rect.centery
-            dist = max(1, math.hypot(dx, dy))
-            self.rect.x += int((dx / dist) * self.speed * 1.05 * dt)
-            self.rect.y += int((dy / dist) * self.speed * 1.05 * dt)
-        elif self.pattern == "arc":
-            start_x = self.pattern_data.get("start_x", self.rect.x)
-            amp = self.pattern_data.get("amp", 120)
-            freq = self.pattern_data.get("freq", 1.2)
-            phase = self.pattern_data.get("phase", 0.0)
-            self.rect.y += int(self.speed * dt)
-            self.rect.x = int(start_x + math.sin(self.age * freq + phase) * amp)
-        elif self.pattern == "zig":
-            start_x = self.pattern_data.get("start_x", self.rect.x)
-            amp = self.pattern_data.get("amp", 140)
-            freq = self.pattern_data.get("freq", 2.4)
-            phase = self.pattern_data.get("phase", 0.0)
-            self.rect.y += int(self.speed * dt)
-            self.rect.x = int(start_x + math.sin(self.age * freq + phase) * amp)
-        elif self.pattern == "v":
-            direction = self.pattern_data.get("direction", 1)
-            vx = self.pattern_data.get("vx", 90)
-            self.rect.y += int(self.speed * dt)
-            self.rect.x += int(direction * vx * dt)
-        elif self.pattern == "stagger":
-            delay = self.pattern_data.get("delay", 0.0)
-            speed_mul = 0.3 if self.age < delay else 1.0
-            self.rect.y += int(self.speed * speed_mul * dt)
-        elif self.pattern == "escort_lead":
-            start_x = self.pattern_data.get("start_x", self.rect.x)
-            phase = self.pattern_data.get("phase", 0.0)
-            self.rect.y += int(self.speed * dt)
-            self.rect.x = int(start_x + math.sin(self.age * 1.2 + phase) * 20)
-        elif self.pattern == "escort_wing":
-            start_x = self.pattern_data.get("start_x", self.rect.x)
-            offset = self.pattern_data.get("offset", 0)
-            phase = self.pattern_data.get("phase", 0.0)
-            self.rect.y += int(self.speed * dt)
-            self.rect.x = int(start_x + offset + math.sin(self.age * 1.5 + phase) * 15)
-        elif self.etype == "shielded":
-            self.rect.y += int(self.speed * 0.6 * dt)
-            self.rect.x += int(math.sin(pygame.time.get_ticks() / 180 + self.zig_phase) * 60 * dt)
-        else:
-            self.rect.y += int(self.speed * dt)
-
-        if self.rect.top > HEIGHT + 40:
-            self.kill()
-
 
 class Boss(pygame.sprite.Sprite):
     def __init__(self, level):
@@ -266,14 +240,14 @@ class Boss(pygame.sprite.Sprite):
                 pygame.Rect(int(w * 0.60), int(h * 0.28), wp_w, wp_h),
             ]
 
-    def update(self, dt):
+    def update(self, dt, t):
         if self.entering:
             self.rect.y += int(self.speed * dt)
             if self.rect.top >= 40:
                 self.entering = False
             return
 
-        self.rect.x += int(math.sin(pygame.time.get_ticks() / 600) * self.speed * dt)
+        self.rect.x += int(math.sin(t / 0.6) * self.speed * dt)
 
         if self.hp < self.max_hp * 0.5:
             self.phase = 2
@@ -1,39 +1,80 @@
 import sys
 import math
 import random
-import os
 import pygame
+import numpy as np
 
-from config import WIDTH, HEIGHT, FPS, TITLE, HUD_COLOR, ENEMY_BULLET_COLOR, ASSET_DIR
+from config import WIDTH, HEIGHT, FPS, IDLE_FPS, SIM_DT, MAX_FRAME_TIME, TITLE, HUD_COLOR, ENEMY_BULLET_COLOR, PLAYER_BULLET_COLOR
+from config import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
 from background import Background
 from audio import AudioManager
-from utils import read_hiscore, write_hiscore
-from entities import Bullet, Particle, Asteroid, PowerUp, Player, Enemy, Boss
+from utils import read_hiscore, write_hiscore, load_font
+from assets import assets
+from bullets import BulletField
+from pool import SpritePool, kill_all
+from spatial import SpatialHash
+from squadron import EnemySquadron, heading_frames
+from sprites import SpriteFactory
+from rng import RngStreams
+from perf import StageTimer, PerfOverlay, PhaseTimer
+from loader import AssetLoader
+from text import TextCache, DigitAtlas
+from particles import ParticleSystem
+from entities import Asteroid, PowerUp, Player, Enemy, Boss
 
 
 class Game:
-    def __init__(self):
-        pygame.mixer.pre_init(22050, -16, 1, 512)
-        pygame.init()
-        self.audio_ok = True
-        try:
-            pygame.mixer.init()
-        except Exception:
+    def __init__(self, headless=False, seed=None, startup=None):
+        self.startup = startup or PhaseTimer()
+        self.startup_report = False
+        self.headless = headless
+        self.running = False
+        self.seed = seed
+        self.rng = RngStreams(seed)
+        self.recorder = None
+        self.perf_csv = None
+        self.timer = StageTimer()
+        self.overlay = None
+        if headless:
             self.audio_ok = False
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption(TITLE)
-        pygame.mouse.set_visible(False)
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("Consolas", 18)
-        self.big_font = pygame.font.SysFont("Consolas", 40)
-        self.scanlines = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for y in range(0, HEIGHT, 6):
-            pygame.draw.line(self.scanlines, (0, 0, 0, 22), (0, y), (WIDTH, y))
-
+            self.screen = None
+            self.clock = None
+            self.font = None
+            self.big_font = None
+            self.text = None
+            self.score_digits = None
+            self.scanlines = None
+        else:
+            pygame.display.init()
+            pygame.font.init()
+            self.audio_ok = True
+            try:
+                pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+            except Exception:
+                self.audio_ok = False
+            self.startup.mark("pygame init")
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption(TITLE)
+            pygame.mouse.set_visible(False)
+            self.clock = pygame.time.Clock()
+            self.startup.mark("display")
+            self.font = load_font(18)
+            self.big_font = load_font(40)
+            self.text = TextCache()
+            self.startup.mark("fonts")
+            self.scanlines = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            for y in range(0, HEIGHT, 6):
+                pygame.draw.line(self.scanlines, (0, 0, 0, 22), (0, y), (WIDTH, y))
+            self.scanlines = self.scanlines.convert_alpha()
+            self.startup.mark("menu assets")
+
+        assets.open_bundle()
         self.audio = AudioManager(self.audio_ok)
-        self.audio.init()
-        self.player_laser = self._load_image("player_laser.png")
-        self.enemy_laser = self._load_image("enemy_laser.png")
+        self.loader = AssetLoader()
+        self.loader.submit_manifest()
+        self.loader.submit(self.audio.init)
+        self.loaded = False
+        self.startup.mark("loader start")
 
         self.state = "MENU"
         self.menu_index = 0
@@ -44,65 +85,101 @@ class Game:
         self.level_duration = 150
         self.hiscore = read_hiscore()
         self.shake = 0
-
-        self.player = Player()
-        self.player_group = pygame.sprite.GroupSingle(self.player)
-        self.life_icon = pygame.transform.scale(self.player.frames[0], (20, 14))
-        self.enemies = pygame.sprite.Group()
-        self.enemy_bullets = pygame.sprite.Group()
-        self.player_bullets = pygame.sprite.Group()
+        self.sim_time = 0.0
+        self.prev_pos = {}
+        self.dirty_rects = False
+        self.dirty = []
+        self.bg_cache = None
+        self.bg_cache_key = None
+        self.static_frame = None
+        self.exposed = False
+
+        self.player = None
+        self.player_group = pygame.sprite.GroupSingle()
+        self.enemies = EnemySquadron()
         self.powerups = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        self.particles = ParticleSystem(rng=self.rng.numpy("particles"))
         self.asteroids = pygame.sprite.Group()
         self.boss_group = pygame.sprite.GroupSingle()
+        self.enemy_pool = SpritePool(Enemy)
+        self.powerup_pool = SpritePool(PowerUp)
+        self.asteroid_pool = SpritePool(Asteroid)
+        self.grid = SpatialHash()
 
         self.spawn_timer = 0
         self.asteroid_timer = 0
-        self.background = Background()
         self.level_transition_timer = 0
+        if headless:
+            self.finish_loading()
 
     def _load_image(self, name):
-        path = os.path.join(ASSET_DIR, name)
-        if os.path.exists(path):
-            try:
-                return pygame.image.load(path).convert_alpha()
-            except Exception:
-                return None
-        return None
+        return assets.image(name)
 
-    def reset_game(self):
+    def finish_loading(self):
+        if self.loaded:
+            return
+        self.loader.wait()
+        self.player_laser = self._load_image("player_laser.png")
+        self.enemy_laser = self._load_image("enemy_laser.png")
+        self.enemy_bullets = BulletField(self.enemy_laser, ENEMY_BULLET_COLOR)
+        self.player_bullets = BulletField(self.player_laser, PLAYER_BULLET_COLOR)
+        self.player = Player()
+        self.player_group = pygame.sprite.GroupSingle(self.player)
+        self.life_icon = pygame.transform.scale(self.player.frames[0], (20, 14))
+        self.background = Background()
+        Asteroid.prebuild()
+        heading_frames("kamikaze", SpriteFactory.enemy_sprite("kamikaze"))
+        if not self.headless:
+            self.score_digits = DigitAtlas(self.font, HUD_COLOR)
+            self.overlay = PerfOverlay(self.timer)
+            self.pause_overlay = self.make_overlay(150, "PAUSED", (255, 200, 120), HEIGHT // 2 - 20)
+            self.level_overlay = self.make_overlay(170, "LEVEL COMPLETE!", (255, 220, 140), HEIGHT // 2 - 30)
+        self.loaded = True
+
+    def reset_game(self, level=1, seed=None, boss=False):
+        self.finish_loading()
+        self.rng = RngStreams(self.seed if seed is None else seed)
+        self.particles.rng = self.rng.numpy("particles")
+        self.sim_time = 0.0
         self.score = 0
-        self.level = 1
-        self.level_time = 0
+        self.level = level
+        self.level_time = self.level_duration if boss else 0
         self.player = Player()
         self.player_group = pygame.sprite.GroupSingle(self.player)
         self.life_icon = pygame.transform.scale(self.player.frames[0], (20, 14))
-        self.enemies.empty()
+        kill_all(self.enemies)
         self.enemy_bullets.empty()
         self.player_bullets.empty()
-        self.powerups.empty()
+        kill_all(self.powerups)
         self.particles.empty()
-        self.asteroids.empty()
+        kill_all(self.asteroids)
         self.boss_group.empty()
         self.spawn_timer = 0
         self.asteroid_timer = 0
         self.background = Background()
+        self.background.scrolling = not self.dirty_rects
         self.level_transition_timer = 0
         self.player.shield = 3
         self.player.triple_shot = 3
         self.state = "PLAYING"
         self.audio.play_bgm(self.level)
         self.audio.start_engine()
+        if self.recorder:
+            self.recorder.begin(self.rng.seed, level, boss)
+
+    def make_enemy(self, x, y, etype):
+        return self.enemy_pool.acquire(x, y, etype, self.level, self.rng.stream("enemies"))
 
     def spawn_formation(self):
+        rng = self.rng.stream("formation")
         patterns = ["line", "zig", "v", "arc", "stagger", "escort"]
-        pattern = random.choice(patterns)
+        pattern = rng.choice(patterns)
         count = 4 + self.level * 2
         if pattern == "line":
             for i in range(count):
                 x = 60 + i * 60 % (WIDTH - 120)
-                y = random.randint(-220, -60)
-                enemy = Enemy(x, y, "basic", self.level)
+                y = rng.randint(-220, -60)
+                enemy = self.make_enemy(x, y, "basic")
                 enemy.set_pattern("line")
                 self.enemies.add(enemy)
             return
@@ -111,7 +188,7 @@ class Game:
                 x = 80 + (i % 2) * (WIDTH - 160)
                 y = -60 - i * 40
                 etype = "kamikaze" if i % 3 == 0 else "basic"
-                enemy = Enemy(x, y, etype, self.level)
+                enemy = self.make_enemy(x, y, etype)
                 enemy.set_pattern("zig", start_x=x, amp=140, freq=2.2, phase=i * 0.6)
                 self.enemies.add(enemy)
             return
@@ -120,7 +197,7 @@ class Game:
                 x = WIDTH // 2 + (i - (count // 2)) * 40
                 y = -60 - abs(i - (count // 2)) * 20
                 direction = -1 if i < (count // 2) else 1
-                enemy = Enemy(x, y, "basic", self.level)
+                enemy = self.make_enemy(x, y, "basic")
                 enemy.set_pattern("v", direction=direction, vx=90)
                 self.enemies.add(enemy)
             return
@@ -130,160 +207,184 @@ class Game:
                 x = int(WIDTH * 0.15 + t * WIDTH * 0.7 + math.sin(t * math.pi) * 120)
                 y = -80 - int(math.cos(t * math.pi) * 50)
                 etype = "basic" if i % 2 == 0 else "shielded"
-                enemy = Enemy(x, y, etype, self.level)
+                enemy = self.make_enemy(x, y, etype)
                 enemy.set_pattern("arc", start_x=x, amp=100, freq=1.1, phase=t * 1.6)
                 self.enemies.add(enemy)
             return
         if pattern == "stagger":
             for i in range(count):
-                x = random.randint(80, WIDTH - 80)
+                x = rng.randint(80, WIDTH - 80)
                 y = -80 - i * 45
                 etype = "kamikaze" if i % 2 == 0 else "basic"
-                enemy = Enemy(x, y, etype, self.level)
+                enemy = self.make_enemy(x, y, etype)
                 enemy.set_pattern("stagger", delay=i * 0.15)
                 self.enemies.add(enemy)
             return
         if pattern == "escort":
-            x = random.randint(180, WIDTH - 180)
-            y = random.randint(-200, -80)
-            lead = Enemy(x, y, "shielded", self.level)
-            lead.set_pattern("escort_lead", start_x=x, phase=random.random() * 2)
-            left = Enemy(x - 70, y + 40, "basic", self.level)
-            left.set_pattern("escort_wing", start_x=x, offset=-70, phase=random.random() * 2)
-            right = Enemy(x + 70, y + 40, "basic", self.level)
-            right.set_pattern("escort_wing", start_x=x, offset=70, phase=random.random() * 2)
+            x = rng.randint(180, WIDTH - 180)
+            y = rng.randint(-200, -80)
+            lead = self.make_enemy(x, y, "shielded")
+            lead.set_pattern("escort_lead", start_x=x, phase=rng.random() * 2)
+            left = self.make_enemy(x - 70, y + 40, "basic")
+            left.set_pattern("escort_wing", start_x=x, offset=-70, phase=rng.random() * 2)
+            right = self.make_enemy(x + 70, y + 40, "basic")
+            right.set_pattern("escort_wing", start_x=x, offset=70, phase=rng.random() * 2)
             self.enemies.add(lead, left, right)
 
     def spawn_enemy_wave(self):
+        rng = self.rng.stream("waves")
         if self.level_time < 18:
             weights = [0.78, 0.18, 0.04]
         elif self.level_time < 45:
             weights = [0.65, 0.22, 0.13]
         else:
             weights = [0.55, 0.25, 0.20]
-        if random.random() < 0.55:
+        if rng.random() < 0.55:
             self.spawn_formation()
             return
         count = 4 + self.level * 2
         types = ["basic", "kamikaze", "shielded"]
         for _ in range(count):
-            etype = random.choices(types, weights=weights)[0]
-            x = random.randint(40, WIDTH - 40)
-            y = random.randint(-200, -40)
-            self.enemies.add(Enemy(x, y, etype, self.level))
+            etype = rng.choices(types, weights=weights)[0]
+            x = rng.randint(40, WIDTH - 40)
+            y = rng.randint(-200, -40)
+            self.enemies.add(self.make_enemy(x, y, etype))
 
     def spawn_asteroid(self):
-        size = random.randint(20, 40)
-        x = random.randint(40, WIDTH - 40)
-        y = random.randint(-120, -40)
-        self.asteroids.add(Asteroid(x, y, size=size))
+        rng = self.rng.stream("asteroids")
+        size = rng.randint(Asteroid.MIN_SIZE, Asteroid.MAX_SIZE)
+        x = rng.randint(40, WIDTH - 40)
+        y = rng.randint(-120, -40)
+        self.asteroids.add(self.asteroid_pool.acquire(x, y, size, rng, self.rng.stream("render")))
 
     def spawn_boss(self):
         boss = Boss(self.level)
         self.boss_group.add(boss)
-        if self.audio.sfx_boss:
-            self.audio.sfx_boss.play()
+        self.audio.play("boss")
 
     def spawn_powerup(self, x, y):
-        if random.random() < 0.22:
-            ptype = random.choice(PowerUp.TYPES)
-            self.powerups.add(PowerUp(x, y, ptype))
+        rng = self.rng.stream("powerups")
+        if rng.random() < 0.22:
+            ptype = rng.choice(PowerUp.TYPES)
+            self.powerups.add(self.powerup_pool.acquire(x, y, ptype))
 
     def fire_player_bullets(self):
         if not self.player.can_shoot():
             return
         self.player.shoot()
-        if self.audio.sfx_pew:
-            self.audio.sfx_pew.play()
+        self.audio.play("pew")
         x, y = self.player.rect.center
         if self.player.triple_shot > 0:
-            for dx in (-14, 0, 14):
-                self.player_bullets.add(Bullet(x + dx, y - 15, image=self.player_laser))
+            self.player_bullets.spawn((x - 14, x, x + 14), y - 15, vy=-520)
         else:
-            self.player_bullets.add(Bullet(x, y - 15, image=self.player_laser))
+            self.player_bullets.spawn(x, y - 15, vy=-520)
 
     def fire_enemy_bullet(self, enemy):
         if len(self.enemy_bullets) > 12 + self.level * 6:
             return
         difficulty = min(1.0, self.level_time / 45)
         chance = 0.003 + difficulty * 0.004 + self.level * 0.0015
-        if random.random() < chance:
-            bullet = Bullet(enemy.rect.centerx, enemy.rect.bottom + 6, speed=190 + self.level * 18, color=ENEMY_BULLET_COLOR, image=self.enemy_laser)
-            self.enemy_bullets.add(bullet)
+        if self.rng.stream("enemy_fire").random() < chance:
+            self.enemy_bullets.spawn(enemy.rect.centerx, enemy.rect.bottom + 6, vy=190 + self.level * 18)
 
-    def fire_boss_bullets(self, boss):
-        if not boss.should_fire(1 / FPS):
+    def fire_boss_bullets(self, boss, dt):
+        if not boss.should_fire(dt):
             return
         if self.level == 1:
             px, py = self.player.rect.center
-            for offset in (-30, 0, 30):
-                bx = boss.rect.centerx + offset
-                by = boss.rect.bottom + 10
-                dx = px - bx
-                dy = py - by
-                dist = max(1, math.hypot(dx, dy))
-                speed = 220
-                bullet = Bullet(bx, by, color=ENEMY_BULLET_COLOR, damage=2, vx=(dx / dist) * speed, vy=(dy / dist) * speed, image=self.enemy_laser)
-                self.enemy_bullets.add(bullet)
+            bx = boss.rect.centerx + np.array((-30, 0, 30))
+            by = boss.rect.bottom + 10
+            dx = px - bx
+            dy = py - by
+            dist = np.maximum(1, np.hypot(dx, dy))
+            speed = 220
+            self.enemy_bullets.spawn(bx, by, (dx / dist) * speed, (dy / dist) * speed, damage=2)
         else:
-            for offset in (-40, 0, 40):
-                bullet = Bullet(boss.rect.centerx + offset, boss.rect.bottom + 10, speed=220 + self.level * 24, color=ENEMY_BULLET_COLOR, damage=2, image=self.enemy_laser)
-                self.enemy_bullets.add(bullet)
+            bx = boss.rect.centerx + np.array((-40, 0, 40))
+            self.enemy_bullets.spawn(bx, boss.rect.bottom + 10, vy=220 + self.level * 24, damage=2)
+
+    def touching(self, rect, kind):
+        return [t for t in self.grid.query(rect) if isinstance(t, kind) and t.alive()]
 
     def handle_collisions(self):
-        for bullet in self.player_bullets:
-            hit_list = pygame.sprite.spritecollide(bullet, self.enemies, False)
-            for enemy in hit_list:
-                enemy.hp -= bullet.damage
-                bullet.kill()
+        grid = self.grid
+        grid.clear()
+        grid.insert_group(self.enemies)
+        grid.insert_group(self.boss_group)
+        grid.insert_group(self.asteroids)
+        grid.insert_group(self.powerups)
+
+        bullets = self.player_bullets
+        boss = self.boss_group.sprite
+        live = []
+        for i, rect in bullets.rects():
+            targets = grid.query(rect)
+            if targets:
+                live.append((i, rect, targets))
+
+        spent = []
+        for i, rect, targets in live:
+            struck = [t for t in targets if isinstance(t, Enemy) and t.alive()]
+            if not struck:
+                continue
+            spent.append(i)
+            for enemy in struck:
+                enemy.hp -= float(bullets.damage[i])
                 if enemy.hp <= 0:
                     self.score += enemy.score_value
                     self.spawn_powerup(enemy.rect.centerx, enemy.rect.centery)
                     self.explode(enemy.rect.centerx, enemy.rect.centery, (255, 120, 120))
                     enemy.kill()
-                    if self.audio.sfx_boom:
-                        self.audio.sfx_boom.play()
+                    self.audio.play("boom")
+        bullets.kill(spent)
 
-        boss = self.boss_group.sprite
-        if boss:
-            for bullet in self.player_bullets:
-                if boss.rect.colliderect(bullet.rect):
-                    if self.level == 3 and boss.phase == 2:
-                        hit_weak = False
-                        for wp in boss.weakpoints:
-                            wp_rect = pygame.Rect(boss.rect.x + wp.x, boss.rect.y + wp.y, wp.w, wp.h)
-                            if wp_rect.colliderect(bullet.rect):
-                                hit_weak = True
-                                break
-                        if hit_weak:
-                            boss.hp -= bullet.damage * 2
-                    else:
-                        boss.hp -= bullet.damage
-                    bullet.kill()
-                    self.shake = 6
-                    if boss.hp <= 0:
-                        self.score += 200
-                        self.explode(boss.rect.centerx, boss.rect.centery, (200, 150, 255))
-                        boss.kill()
-                        self.level_complete()
-
-        if pygame.sprite.spritecollide(self.player, self.enemy_bullets, True):
+        boss_hits = [(i, rect) for i, rect, targets in live if bullets.alive[i] and boss in targets]
+        if boss_hits:
+            hits = [i for i, _ in boss_hits]
+            if self.level == 3 and boss.phase == 2:
+                wp_rects = [pygame.Rect(boss.rect.x + wp.x, boss.rect.y + wp.y, wp.w, wp.h) for wp in boss.weakpoints]
+                weak = [i for i, rect in boss_hits if rect.collidelist(wp_rects) != -1]
+                boss.hp -= bullets.total_damage(weak) * 2
+            else:
+                boss.hp -= bullets.total_damage(hits)
+            bullets.kill(hits)
+            self.shake = 6
+            if boss.hp <= 0:
+                self.score += 200
+                self.explode(boss.rect.centerx, boss.rect.centery, (200, 150, 255))
+                boss.kill()
+                self.level_complete()
+
+        hits = self.enemy_bullets.collide(self.player.rect)
+        if len(hits):
+            self.enemy_bullets.kill(hits)
             self.on_player_hit()
 
-        if pygame.sprite.spritecollide(self.player, self.enemies, True):
+        rammed = self.touching(self.player.rect, Enemy)
+        if rammed:
+            for enemy in rammed:
+                enemy.kill()
             self.on_player_hit()
 
-        if pygame.sprite.spritecollide(self.player, self.asteroids, True):
+        rammed = self.touching(self.player.rect, Asteroid)
+        if rammed:
+            for asteroid in rammed:
+                asteroid.kill()
             self.on_player_hit()
-        for bullet in self.player_bullets:
-            if pygame.sprite.spritecollide(bullet, self.asteroids, True):
-                bullet.kill()
-                self.explode(bullet.rect.centerx, bullet.rect.centery, (150, 120, 90))
-
-        for p in pygame.sprite.spritecollide(self.player, self.powerups, True):
+        for i, rect, targets in live:
+            if not bullets.alive[i]:
+                continue
+            struck = [t for t in targets if isinstance(t, Asteroid) and t.alive()]
+            if struck:
+                for asteroid in struck:
+                    asteroid.kill()
+                bullets.kill(i)
+                self.explode(*bullets.position(i), (150, 120, 90))
+
+        for p in self.touching(self.player.rect, PowerUp):
+            p.kill()
             self.score += 50
-            if self.audio.sfx_power:
-                self.audio.sfx_power.play()
+            self.audio.play("power")
             if p.ptype == "speed":
                 self.player.speed = min(400, self.player.speed + 60)
             elif p.ptype == "triple":
@@ -291,6 +392,16 @@ class Game:
             elif p.ptype == "shield":
                 self.player.shield = 6
 
+    def pool_stats(self):
+        return {
+            "enemies": self.enemy_pool.stats(),
+            "powerups": self.powerup_pool.stats(),
+            "asteroids": self.asteroid_pool.stats(),
+            "player_bullets": self.player_bullets.stats(),
+            "enemy_bullets": self.enemy_bullets.stats(),
+            "particles": self.particles.stats(),
+        }
+
     def on_player_hit(self):
         hit = self.player.hit()
         self.shake = 10
@@ -299,8 +410,7 @@ class Game:
             self.game_over()
 
     def explode(self, x, y, color):
-        for _ in range(20):
-            self.particles.add(Particle(x, y, color))
+        self.particles.emit(x, y, color, 20)
 
     def level_complete(self):
         self.state = "LEVEL_COMPLETE"
@@ -312,11 +422,11 @@ class Game:
         self.state = "GAME_OVER"
         self.audio.stop_bgm()
         self.audio.stop_engine()
-        if self.audio.sfx_gameover:
-            self.audio.sfx_gameover.play()
+        self.audio.play("gameover")
         if self.score > self.hiscore:
             self.hiscore = self.score
-            write_hiscore(self.hiscore)
+            if not self.headless:
+                write_hiscore(self.hiscore)
 
     def update_background(self, dt):
         self.background.update(dt)
@@ -324,15 +434,18 @@ class Game:
     def draw_background(self, surface):
         self.background.draw(surface, self.level)
 
-    def draw_hud(self):
-        score_text = self.font.render(f"Score: {self.score}", True, HUD_COLOR)
-        lives_text = self.font.render(f"Lives: {self.player.lives}", True, HUD_COLOR)
-        level_text = self.font.render(f"Level: {self.level}", True, HUD_COLOR)
-        self.screen.blit(score_text, (10, 8))
-        self.screen.blit(lives_text, (WIDTH // 2 - 60, 8))
-        self.screen.blit(level_text, (WIDTH - 130, 8))
+    def draw_hud(self, surface):
+        score_label = self.text.render(self.font, "Score: ", HUD_COLOR)
+        lives_text = self.text.render(self.font, f"Lives: {self.player.lives}", HUD_COLOR)
+        level_text = self.text.render(self.font, f"Level: {self.level}", HUD_COLOR)
+        rects = [
+            surface.blit(score_label, (10, 8)),
+            self.score_digits.draw(surface, self.score, (10 + score_label.get_width(), 8)),
+            surface.blit(lives_text, (WIDTH // 2 - 60, 8)),
+            surface.blit(level_text, (WIDTH - 130, 8)),
+        ]
         for i in range(self.player.lives):
-            self.screen.blit(self.life_icon, (10 + i * 22, 30))
+            rects.append(surface.blit(self.life_icon, (10 + i * 22, 30)))
 
         boss = self.boss_group.sprite
         if boss:
@@ -340,34 +453,77 @@ class Game:
             bar_h = 12
             x = WIDTH // 2 - bar_w // 2
             y = 30
-            pygame.draw.rect(self.screen, (60, 30, 30), (x, y, bar_w, bar_h))
+            rects.append(pygame.draw.rect(surface, (60, 30, 30), (x, y, bar_w, bar_h)))
             hp_w = int(bar_w * (boss.hp / boss.max_hp))
-            pygame.draw.rect(self.screen, (255, 120, 80), (x, y, hp_w, bar_h))
+            pygame.draw.rect(surface, (255, 120, 80), (x, y, hp_w, bar_h))
+        return rects
+
+    def entity_counts(self):
+        return {
+            "enm": len(self.enemies),
+            "eb": len(self.enemy_bullets),
+            "pb": len(self.player_bullets),
+            "pu": len(self.powerups),
+            "ast": len(self.asteroids),
+            "fx": len(self.particles),
+            "drop": self.audio.dropped,
+            "steal": self.audio.stolen,
+        }
+
+    def profile_bucket(self):
+        if self.state in ("MENU", "OPTIONS", "HIGHSCORES", "LOADING"):
+            return self.state
+        phase = "boss" if self.boss_group.sprite else "waves"
+        return f"{self.state};level{self.level};{phase}"
+
+    def draw_overlay(self, surface):
+        if not (self.overlay and self.overlay.visible):
+            return []
+        self.timer.push("overlay")
+        rect = self.overlay.draw(surface, self.entity_counts())
+        self.timer.pop()
+        return [rect]
 
     def draw_menu(self, surface):
         surface.fill((8, 20, 40))
-        title = self.big_font.render(TITLE, True, (250, 220, 130))
+        title = self.text.render(self.big_font, TITLE, (250, 220, 130))
         surface.blit(title, (WIDTH // 2 - title.get_width() // 2, 120))
         options = ["Play", "Options", "High Scores", "Quit"]
         for i, opt in enumerate(options):
             color = (255, 160, 80) if i == self.menu_index else (230, 235, 240)
-            text = self.font.render(opt, True, color)
+            text = self.text.render(self.font, opt, color)
             surface.blit(text, (WIDTH // 2 - text.get_width() // 2, 250 + i * 36))
+        if not self.loader.done():
+            self.draw_progress(surface, HEIGHT - 40)
+        surface.blit(self.scanlines, (0, 0))
+
+    def draw_progress(self, surface, y):
+        done, total = self.loader.progress()
+        bar_w = 300
+        x = WIDTH // 2 - bar_w // 2
+        pygame.draw.rect(surface, (40, 60, 80), (x, y, bar_w, 8))
+        pygame.draw.rect(surface, (255, 160, 80), (x, y, bar_w * done // max(1, total), 8))
+
+    def draw_loading(self, surface):
+        surface.fill((8, 20, 40))
+        text = self.text.render(self.big_font, "Loading...", (250, 220, 130))
+        surface.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 50))
+        self.draw_progress(surface, HEIGHT // 2 + 10)
         surface.blit(self.scanlines, (0, 0))
 
     def draw_highscores(self, surface):
         surface.fill((8, 20, 40))
-        title = self.big_font.render("High Scores", True, (250, 220, 130))
+        title = self.text.render(self.big_font, "High Scores", (250, 220, 130))
         surface.blit(title, (WIDTH // 2 - title.get_width() // 2, 120))
-        hs = self.font.render(f"Best: {self.hiscore}", True, (230, 235, 240))
+        hs = self.text.render(self.font, f"Best: {self.hiscore}", (230, 235, 240))
         surface.blit(hs, (WIDTH // 2 - hs.get_width() // 2, 220))
-        tip = self.font.render("Press ESC to return", True, (200, 210, 220))
+        tip = self.text.render(self.font, "Press ESC to return", (200, 210, 220))
         surface.blit(tip, (WIDTH // 2 - tip.get_width() // 2, 320))
         surface.blit(self.scanlines, (0, 0))
 
     def draw_options(self, surface):
         surface.fill((8, 20, 40))
-        title = self.big_font.render("Options", True, (250, 220, 130))
+        title = self.text.render(self.big_font, "Options", (250, 220, 130))
         surface.blit(title, (WIDTH // 2 - title.get_width() // 2, 90))
 
         items = [
@@ -376,7 +532,7 @@ class Game:
         ]
         for i, (label, val) in enumerate(items):
             color = (255, 160, 80) if i == self.options_index else (230, 235, 240)
-            text = self.font.render(f"{label}: {int(val * 100):3d}%", True, color)
+            text = self.text.render(self.font, f"{label}: {int(val * 100):3d}%", color)
             surface.blit(text, (WIDTH // 2 - 140, 200 + i * 36))
             bar_x = WIDTH // 2 + 30
             bar_y = 205 + i * 36
@@ -391,49 +547,94 @@ class Game:
             "ESC - Back",
         ]
         for i, line in enumerate(controls):
-            text = self.font.render(line, True, (200, 210, 220))
+            text = self.text.render(self.font, line, (200, 210, 220))
             surface.blit(text, (WIDTH // 2 - 140, 320 + i * 22))
         surface.blit(self.scanlines, (0, 0))
 
-    def draw_pause(self):
+    def make_overlay(self, shade, label, color, y):
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
-        text = self.big_font.render("PAUSED", True, (255, 200, 120))
-        self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 20))
+        overlay.fill((0, 0, 0, shade))
+        text = self.text.render(self.big_font, label, color)
+        overlay.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
+        return overlay.convert_alpha()
+
+    def draw_pause(self, surface):
+        surface.blit(self.pause_overlay, (0, 0))
 
     def draw_level_complete(self, surface):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 170))
-        surface.blit(overlay, (0, 0))
-        text = self.big_font.render("LEVEL COMPLETE!", True, (255, 220, 140))
-        surface.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 30))
+        surface.blit(self.level_overlay, (0, 0))
 
     def draw_game_over(self, surface):
         surface.fill((0, 0, 0))
-        text = self.big_font.render("GAME OVER", True, (255, 120, 90))
+        text = self.text.render(self.big_font, "GAME OVER", (255, 120, 90))
         surface.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 40))
-        score = self.font.render(f"Final Score: {self.score}", True, (230, 235, 240))
+        score = self.text.render(self.font, f"Final Score: {self.score}", (230, 235, 240))
         surface.blit(score, (WIDTH // 2 - score.get_width() // 2, HEIGHT // 2 + 10))
-        tip = self.font.render("Press ENTER to return to menu", True, (200, 210, 220))
+        tip = self.text.render(self.font, "Press ENTER to return to menu", (200, 210, 220))
         surface.blit(tip, (WIDTH // 2 - tip.get_width() // 2, HEIGHT // 2 + 50))
         surface.blit(self.scanlines, (0, 0))
 
     def draw_ending(self, surface):
         surface.fill((0, 0, 0))
-        text = self.big_font.render("YOU WIN!", True, (255, 220, 140))
+        text = self.text.render(self.big_font, "YOU WIN!", (255, 220, 140))
         surface.blit(text, (WIDTH // 2 - text.get_width() // 2, 140))
-        score = self.font.render(f"Final Score: {self.score}", True, (230, 235, 240))
+        score = self.text.render(self.font, f"Final Score: {self.score}", (230, 235, 240))
         surface.blit(score, (WIDTH // 2 - score.get_width() // 2, 220))
-        credits = self.font.render("Thanks for playing Galaxy Fury", True, (200, 210, 220))
+        credits = self.text.render(self.font, "Thanks for playing Galaxy Fury", (200, 210, 220))
         surface.blit(credits, (WIDTH // 2 - credits.get_width() // 2, 280))
-        tip = self.font.render("Press ENTER to return to menu", True, (200, 210, 220))
+        tip = self.text.render(self.font, "Press ENTER to return to menu", (200, 210, 220))
         surface.blit(tip, (WIDTH // 2 - tip.get_width() // 2, 340))
         surface.blit(self.scanlines, (0, 0))
 
-    def update(self, dt):
+    def step(self, keys=None, pressed=()):
+        recorder = self.recorder
+        taken = []
+        for key in pressed:
+            live = recorder is not None and recorder.active
+            self.handle_key(key)
+            if live:
+                taken.append(key)
+        if self.state == "LOADING" and self.loader.done():
+            self.reset_game()
+        if self.state != "PAUSED":
+            self.timer.push("update")
+            if not self.headless:
+                self.snapshot()
+            self.update(SIM_DT, keys)
+            self.timer.pop()
+        if recorder is not None and recorder.active:
+            recorder.record(keys, taken, self)
+            if self.state in ("GAME_OVER", "ENDING"):
+                recorder.finish()
+
+    def snapshot(self):
+        self.prev_pos = {
+            sprite: sprite.rect.topleft
+            for group in (self.player_group, self.boss_group, self.asteroids, self.powerups)
+            for sprite in group
+        }
+
+    def lerp_pos(self, sprite, alpha):
+        x, y = sprite.rect.topleft
+        prev = self.prev_pos.get(sprite)
+        if prev is None or abs(x - prev[0]) > 64 or abs(y - prev[1]) > 64:
+            return x, y
+        return int(prev[0] + (x - prev[0]) * alpha), int(prev[1] + (y - prev[1]) * alpha)
+
+    def draw_group(self, surface, group, alpha, dirty=False):
+        blits = []
+        for sprite in group:
+            x, y = self.lerp_pos(sprite, alpha)
+            image = sprite.image
+            w, h = sprite.rect.size
+            blits.append((image, (x + (w - image.get_width()) // 2, y + (h - image.get_height()) // 2)))
+        return surface.blits(blits, dirty)
+
+    def update(self, dt, keys=None):
+        self.sim_time += dt
         if self.state == "PLAYING":
-            keys = pygame.key.get_pressed()
+            if keys is None:
+                keys = pygame.key.get_pressed()
             self.player.update(dt, keys)
             self.update_background(dt)
 
@@ -448,8 +649,8 @@ class Game:
                     self.spawn_timer = 0
                     self.spawn_enemy_wave()
 
+            self.enemies.update(dt, self.player, self.sim_time)
             for enemy in self.enemies:
-                enemy.update(dt, self.player)
                 self.fire_enemy_bullet(enemy)
 
             if self.level_time >= self.level_duration and not self.boss_group.sprite:
@@ -457,13 +658,14 @@ class Game:
 
             boss = self.boss_group.sprite
             if boss:
-                boss.update(dt)
-                self.fire_boss_bullets(boss)
+                boss.update(dt, self.sim_time)
+                self.fire_boss_bullets(boss, dt)
                 if self.level == 2 and boss.should_spawn_minion(dt):
+                    rng = self.rng.stream("minions")
                     for _ in range(2):
-                        x = boss.rect.centerx + random.randint(-60, 60)
-                        y = boss.rect.bottom + random.randint(10, 40)
-                        self.enemies.add(Enemy(x, y, "basic", self.level))
+                        x = boss.rect.centerx + rng.randint(-60, 60)
+                        y = boss.rect.bottom + rng.randint(10, 40)
+                        self.enemies.add(self.make_enemy(x, y, "basic"))
 
             if self.level == 2 and not self.boss_group.sprite:
                 self.asteroid_timer += dt
@@ -477,7 +679,9 @@ class Game:
             self.particles.update(dt)
             self.asteroids.update(dt)
 
+            self.timer.push("collisions")
             self.handle_collisions()
+            self.timer.pop()
 
         elif self.state == "LEVEL_COMPLETE":
             self.level_transition_timer -= dt
@@ -489,12 +693,12 @@ class Game:
                     self.audio.stop_engine()
                 else:
                     self.level_time = 0
-                    self.enemies.empty()
+                    kill_all(self.enemies)
                     self.enemy_bullets.empty()
                     self.player_bullets.empty()
                     self.boss_group.empty()
-                    self.powerups.empty()
-                    self.asteroids.empty()
+                    kill_all(self.powerups)
+                    kill_all(self.asteroids)
                     self.player.shield = max(self.player.shield, 2)
                     self.player.triple_shot = max(self.player.triple_shot, 2)
                     self.state = "PLAYING"
@@ -503,11 +707,14 @@ class Game:
 
         self.shake = max(0, self.shake - dt * 10)
 
-    def draw(self, target=None):
+    def draw(self, target=None, alpha=1.0):
         surface = target or self.screen
         if self.state == "MENU":
             self.draw_menu(surface)
             return
+        if self.state == "LOADING":
+            self.draw_loading(surface)
+            return
         if self.state == "HIGHSCORES":
             self.draw_highscores(surface)
             return
@@ -522,97 +729,221 @@ class Game:
             return
 
         self.draw_background(surface)
-        if not (self.player.invuln > 0 and int(pygame.time.get_ticks() / 120) % 2 == 0):
-            self.player_group.draw(surface)
-        self.enemies.draw(surface)
-        self.player_bullets.draw(surface)
-        self.enemy_bullets.draw(surface)
-        self.powerups.draw(surface)
-        self.particles.draw(surface)
-        self.asteroids.draw(surface)
-        if self.boss_group.sprite:
-            self.boss_group.draw(surface)
-            boss = self.boss_group.sprite
-            if self.level == 3 and boss.phase == 2:
-                for wp in boss.weakpoints:
-                    pygame.draw.rect(surface, (80, 255, 160), (boss.rect.x + wp.x, boss.rect.y + wp.y, wp.w, wp.h), 2)
-        self.draw_hud()
+        self.draw_entities(surface, alpha)
 
         if self.state == "LEVEL_COMPLETE":
             self.draw_level_complete(surface)
 
+        self.timer.push("scanlines")
         surface.blit(self.scanlines, (0, 0))
+        self.timer.pop()
+
+    def draw_entities(self, surface, alpha, dirty=False):
+        rects = []
+        if not (self.player.invuln > 0 and int(self.sim_time / 0.12) % 2 == 0):
+            rects.extend(self.draw_group(surface, self.player_group, alpha, dirty) or ())
+        rects.extend(self.enemies.draw(surface, alpha, dirty) or ())
+        rects.extend(self.player_bullets.draw(surface, alpha, dirty) or ())
+        rects.extend(self.enemy_bullets.draw(surface, alpha, dirty) or ())
+        rects.extend(self.draw_group(surface, self.powerups, alpha, dirty) or ())
+        rects.extend(self.particles.draw(surface, alpha, dirty) or ())
+        rects.extend(self.draw_group(surface, self.asteroids, alpha, dirty) or ())
+        boss = self.boss_group.sprite
+        if boss:
+            bx, by = self.lerp_pos(boss, alpha)
+            rects.append(surface.blit(boss.image, (bx, by)))
+            if self.level == 3 and boss.phase == 2:
+                for wp in boss.weakpoints:
+                    pygame.draw.rect(surface, (80, 255, 160), (bx + wp.x, by + wp.y, wp.w, wp.h), 2)
+        rects.extend(self.draw_hud(surface))
+        rects.extend(self.draw_overlay(surface))
+        return rects
 
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS) / 1000
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if self.state == "MENU":
-                        if event.key == pygame.K_UP:
-                            self.menu_index = (self.menu_index - 1) % 4
-                        if event.key == pygame.K_DOWN:
-                            self.menu_index = (self.menu_index + 1) % 4
-                        if event.key == pygame.K_RETURN:
-                            if self.menu_index == 0:
-                                self.reset_game()
-                            elif self.menu_index == 1:
-                                self.state = "OPTIONS"
-                            elif self.menu_index == 2:
-                                self.state = "HIGHSCORES"
-                            elif self.menu_index == 3:
-                                running = False
-                    elif self.state == "HIGHSCORES":
-                        if event.key == pygame.K_ESCAPE:
-                            self.state = "MENU"
-                    elif self.state == "OPTIONS":
-                        if event.key == pygame.K_ESCAPE:
-                            self.state = "MENU"
-                        if event.key == pygame.K_UP:
-                            self.options_index = (self.options_index - 1) % 2
-                        if event.key == pygame.K_DOWN:
-                            self.options_index = (self.options_index + 1) % 2
-                        if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
-                            delta = -0.05 if event.key == pygame.K_LEFT else 0.05
-                            if self.options_index == 0:
-                                self.audio.set_sfx_volume(self.audio.sfx_volume + delta)
-                            elif self.options_index == 1:
-                                self.audio.set_music_volume(self.audio.music_volume + delta)
-                    elif self.state == "PLAYING":
-                        if event.key == pygame.K_SPACE:
-                            self.fire_player_bullets()
-                        if event.key == pygame.K_p:
-                            self.state = "PAUSED"
-                            self.audio.stop_engine()
-                    elif self.state == "PAUSED":
-                        if event.key == pygame.K_p:
-                            self.state = "PLAYING"
-                            self.audio.start_engine()
-                    elif self.state in ("GAME_OVER", "ENDING"):
-                        if event.key == pygame.K_RETURN:
-                            self.state = "MENU"
+    def handle_key(self, key):
+        if self.state == "MENU":
+            if key == pygame.K_UP:
+                self.menu_index = (self.menu_index - 1) % 4
+            if key == pygame.K_DOWN:
+                self.menu_index = (self.menu_index + 1) % 4
+            if key == pygame.K_RETURN:
+                if self.menu_index == 0:
+                    if self.loader.done():
+                        self.reset_game()
+                    else:
+                        self.state = "LOADING"
+                elif self.menu_index == 1:
+                    self.state = "OPTIONS"
+                elif self.menu_index == 2:
+                    self.state = "HIGHSCORES"
+                elif self.menu_index == 3:
+                    self.running = False
+        elif self.state == "HIGHSCORES":
+            if key == pygame.K_ESCAPE:
+                self.state = "MENU"
+        elif self.state == "OPTIONS":
+            if key == pygame.K_ESCAPE:
+                self.state = "MENU"
+            if key == pygame.K_UP:
+                self.options_index = (self.options_index - 1) % 2
+            if key == pygame.K_DOWN:
+                self.options_index = (self.options_index + 1) % 2
+            if key in (pygame.K_LEFT, pygame.K_RIGHT):
+                delta = -0.05 if key == pygame.K_LEFT else 0.05
+                if self.options_index == 0:
+                    self.audio.set_sfx_volume(self.audio.sfx_volume + delta)
+                elif self.options_index == 1:
+                    self.audio.set_music_volume(self.audio.music_volume + delta)
+        elif self.state == "PLAYING":
+            if key == pygame.K_SPACE:
+                self.fire_player_bullets()
+            if key == pygame.K_p:
+                self.state = "PAUSED"
+                self.audio.stop_engine()
+        elif self.state == "PAUSED":
+            if key == pygame.K_p:
+                self.state = "PLAYING"
+                self.audio.start_engine()
+        elif self.state in ("GAME_OVER", "ENDING"):
+            if key == pygame.K_RETURN:
+                self.state = "MENU"
+
+    def apply_shake(self, surface):
+        amount = int(self.shake)
+        if amount <= 0:
+            return
+        dx = random.randint(-amount, amount)
+        dy = random.randint(-amount, amount)
+        surface.scroll(dx, dy)
+        if dx > 0:
+            surface.fill((0, 0, 0), (0, 0, dx, HEIGHT))
+        elif dx < 0:
+            surface.fill((0, 0, 0), (WIDTH + dx, 0, -dx, HEIGHT))
+        if dy > 0:
+            surface.fill((0, 0, 0), (0, 0, WIDTH, dy))
+        elif dy < 0:
+            surface.fill((0, 0, 0), (0, HEIGHT + dy, WIDTH, -dy))
+
+    def render_dirty(self, alpha):
+        timer = self.timer
+        timer.push("draw")
+        screen = self.screen
+        key = (id(self.background), self.level, self.background.time)
+        if self.bg_cache is None or self.bg_cache_key != key:
+            self.bg_cache = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.bg_cache_key = key
+            self.draw_background(self.bg_cache)
+            self.bg_cache.blit(self.scanlines, (0, 0))
+            screen.blit(self.bg_cache, (0, 0))
+            previous = [screen.get_rect()]
+        else:
+            previous = self.dirty
+            cache = self.bg_cache
+            screen.blits([(cache, rect, rect) for rect in previous], False)
+        drawn = self.draw_entities(screen, alpha, True)
+        timer.pop()
+        timer.push("flip")
+        pygame.display.update(previous + drawn)
+        timer.pop()
+        self.dirty = drawn
+
+    def static_key(self):
+        state = self.state
+        if state == "MENU":
+            return (state, self.menu_index, None if self.loaded else self.loader.progress())
+        if state == "LOADING":
+            return (state, self.loader.progress())
+        if state == "OPTIONS":
+            return (state, self.options_index, self.audio.sfx_volume, self.audio.music_volume)
+        if state == "HIGHSCORES":
+            return (state, self.hiscore)
+        if state in ("GAME_OVER", "ENDING"):
+            return (state, self.score)
+        if state == "PAUSED":
+            return (state,)
+        return None
 
+    def render_static(self, key, alpha):
+        if key == self.static_frame and not self.exposed:
+            return
+        self.bg_cache = None
+        timer = self.timer
+        if key != self.static_frame:
+            timer.push("draw")
             if self.state == "PAUSED":
-                self.draw()
-                self.draw_pause()
-                pygame.display.flip()
-                continue
-
-            self.update(dt)
-
-            scene = pygame.Surface((WIDTH, HEIGHT))
-            self.draw(scene)
-            if self.shake > 0:
-                offset_x = random.randint(-int(self.shake), int(self.shake))
-                offset_y = random.randint(-int(self.shake), int(self.shake))
-                self.screen.blit(scene, (offset_x, offset_y))
+                self.draw_pause(self.screen)
             else:
-                self.screen.blit(scene, (0, 0))
+                self.draw(self.screen, alpha)
+            timer.pop()
+        timer.push("flip")
+        pygame.display.flip()
+        timer.pop()
+        self.static_frame = key
+        self.exposed = False
+
+    def render(self, alpha=1.0):
+        key = self.static_key()
+        if key is not None:
+            self.render_static(key, alpha)
+            return
+        self.static_frame = None
+        if self.dirty_rects and self.state == "PLAYING" and self.shake <= 0 and not self.background.moving():
+            self.render_dirty(alpha)
+            return
+        self.bg_cache = None
+        timer = self.timer
+        timer.push("draw")
+        self.draw(self.screen, alpha)
+        self.apply_shake(self.screen)
+        timer.pop()
+        timer.push("flip")
+        pygame.display.flip()
+        timer.pop()
+
+    def report_startup(self):
+        phases = [name for name, _ in self.startup.phases]
+        if "first frame" not in phases:
+            self.startup.mark("first frame")
+        if not self.loader.done():
+            return
+        self.startup.mark("assets ready")
+        print("startup:")
+        print(self.startup.report())
+        self.startup_report = False
 
-            pygame.display.flip()
+    def run(self):
+        self.running = True
+        if self.perf_csv:
+            self.timer.listeners.append(self.perf_csv)
+        accumulator = 0.0
+        pressed = []
+        while self.running:
+            fps = FPS if self.static_key() is None else IDLE_FPS
+            accumulator += min(self.clock.tick(fps) / 1000, MAX_FRAME_TIME)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.exposed = True
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3 and self.overlay:
+                        self.overlay.toggle()
+                        continue
+                    pressed.append(event.key)
 
+            self.audio.update()
+            keys = pygame.key.get_pressed()
+            while accumulator >= SIM_DT and self.running:
+                self.step(keys, pressed)
+                pressed = []
+                accumulator -= SIM_DT
+            self.render(accumulator / SIM_DT)
+            self.timer.end_frame()
+            if self.startup_report:
+                self.report_startup()
+
+        if self.recorder:
+            self.recorder.finish()
+        if self.perf_csv:
+            self.perf_csv.close()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,65 @@
+import time
+import pygame
+
+from game import Game
+from assets import assets
+
+
+class KeyState:
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    def __init__(self, script):
+        self.script = script
+
+    def poll(self, tick, game):
+        held, pressed = self.script(tick, game)
+        return KeyState(held), list(pressed)
+
+
+def autopilot(tick, game):
+    held = [pygame.K_LEFT if (tick // 90) % 2 else pygame.K_RIGHT]
+    pressed = [pygame.K_SPACE] if tick % 9 == 0 else []
+    return held, pressed
+
+
+def run_headless(ticks=3600, level=1, boss=False, restart=False, input_source=None, seed=None, recorder=None):
+    game = Game(headless=True, seed=seed)
+    game.recorder = recorder
+    source = input_source or ScriptedInput(autopilot)
+
+    def start():
+        game.reset_game(level, boss=boss)
+
+    start()
+    restarts = 0
+    tick = 0
+    began = time.perf_counter()
+    while tick < ticks:
+        keys, pressed = source.poll(tick, game)
+        game.step(keys, pressed)
+        tick += 1
+        if game.state in ("GAME_OVER", "ENDING"):
+            if not restart:
+                break
+            restarts += 1
+            start()
+    elapsed = time.perf_counter() - began
+    if recorder:
+        recorder.finish()
+    return {
+        "ticks": tick,
+        "elapsed": elapsed,
+        "ticks_per_second": tick / elapsed if elapsed > 0 else 0.0,
+        "state": game.state,
+        "level": game.level,
+        "score": game.score,
+        "restarts": restarts,
+        "pools": game.pool_stats(),
+        "assets": assets.stats(),
+    }
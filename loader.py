@@ -0,0 +1,38 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import assets, read_manifest, MANIFEST
+from atlas import atlas
+
+
+class AssetLoader:
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asset-loader")
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = self.executor.submit(fn, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def submit_manifest(self, path=MANIFEST):
+        jobs = read_manifest(path)
+        for kind, args in jobs:
+            if kind == "atlas":
+                self.submit(atlas.load)
+            else:
+                self.submit(getattr(assets, kind), *args)
+        return len(jobs)
+
+    def progress(self):
+        done = sum(1 for future in self.futures if future.done())
+        return done, len(self.futures)
+
+    def done(self):
+        return all(future.done() for future in self.futures)
+
+    def wait(self):
+        for future in self.futures:
+            future.result()
+        self.executor.shutdown(wait=False)
@@ -1,5 +1,105 @@
+import time
+
+STARTED = time.perf_counter()
+
+import os
+import argparse
+
 from game import Game
+from perf import PhaseTimer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Galaxy Fury")
+    parser.add_argument("--headless", action="store_true", help="run the simulation without a window or audio")
+    parser.add_argument("--ticks", type=int, default=3600, help="headless: number of simulation ticks")
+    parser.add_argument("--level", type=int, default=1, choices=(1, 2, 3), help="headless: starting level")
+    parser.add_argument("--boss", action="store_true", help="headless: skip straight to the boss fight")
+    parser.add_argument("--restart", action="store_true", help="headless: restart the level on game over")
+    parser.add_argument("--seed", type=int, help="seed for every gameplay random stream")
+    parser.add_argument("--record", metavar="PATH", help="record the first session to a replay file")
+    parser.add_argument("--record-hashes", action="store_true", help="store a state hash for every recorded tick")
+    parser.add_argument("--replay", metavar="PATH", help="play a replay back headless at maximum speed")
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=os.environ.get("GALAXY_FURY_PROFILE"),
+        help="sample the game loop and write per-state collapsed stacks (also GALAXY_FURY_PROFILE)",
+    )
+    parser.add_argument(
+        "--dirty-rects", action="store_true", help="hold the background still and repaint only changed regions while playing (for low-end machines)"
+    )
+    parser.add_argument("--startup-report", action="store_true", help="print a per-phase startup timing breakdown")
+    parser.add_argument("--perf-csv", metavar="PATH", help="write per-frame stage timings (ms) to a CSV file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    recorder = None
+    if args.record:
+        from replay import ReplayRecorder
+
+        recorder = ReplayRecorder(args.record, hashes=args.record_hashes)
+
+    if args.replay:
+        from replay import Replay, play
+
+        result = play(Replay.load(args.replay))
+        print(
+            f"{result['ticks']} ticks in {result['elapsed']:.2f}s "
+            f"({result['ticks_per_second']:.0f} ticks/s) state={result['state']} score={result['score']}"
+        )
+        divergence = result["divergence"]
+        if divergence:
+            print(f"diverged at tick {divergence['tick']}: expected {divergence['expected']:08x}, got {divergence['actual']:08x}")
+            raise SystemExit(1)
+        return
+
+    if args.headless:
+        from headless import run_headless
+
+        stats = run_headless(
+            args.ticks, level=args.level, boss=args.boss, restart=args.restart, seed=args.seed, recorder=recorder
+        )
+        print(
+            f"{stats['ticks']} ticks in {stats['elapsed']:.2f}s "
+            f"({stats['ticks_per_second']:.0f} ticks/s) "
+            f"state={stats['state']} level={stats['level']} score={stats['score']} restarts={stats['restarts']}"
+        )
+        for name, pool in stats["pools"].items():
+            print(f"  pool {name}: hits={pool['hits']} misses={pool['misses']} free={pool['free']}")
+        cache = stats["assets"]
+        print(
+            f"  assets: entries={cache['entries']} hits={cache['hits']} misses={cache['misses']} "
+            f"evictions={cache['evictions']} resident={cache['resident'] // 1024}KB"
+        )
+        return
+
+    startup = PhaseTimer(STARTED)
+    startup.mark("imports")
+    game = Game(seed=args.seed, startup=startup)
+    game.startup_report = args.startup_report
+    game.recorder = recorder
+    game.dirty_rects = args.dirty_rects
+    if args.perf_csv:
+        from perf import FrameCsv
+
+        game.perf_csv = FrameCsv(args.perf_csv)
+    if not args.profile:
+        game.run()
+        return
+
+    from profiler import SamplingProfiler
+
+    profiler = SamplingProfiler(args.profile, game.profile_bucket)
+    profiler.start()
+    try:
+        game.run()
+    finally:
+        samples = profiler.stop()
+        print(f"{samples} samples written to {args.profile}")
 
 
 if __name__ == "__main__":
-    Game().run()
+    main()
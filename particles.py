@@ -0,0 +1,88 @@
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    FIELDS = ("x", "y", "px", "py", "vx", "vy", "life", "color")
+
+    def __init__(self, capacity=2048, size=3, rng=None):
+        self.capacity = capacity
+        self.size = size
+        self.rng = rng or np.random.default_rng()
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.px = np.zeros(capacity)
+        self.py = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.sprites = []
+        self._color_index = {}
+
+    def __len__(self):
+        return self.count
+
+    def _sprite_for(self, color):
+        idx = self._color_index.get(color)
+        if idx is None:
+            surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+            surf.fill(color)
+            idx = len(self.sprites)
+            self.sprites.append(surf)
+            self._color_index[color] = idx
+        return idx
+
+    def emit(self, x, y, color, count=20, lifespan=0.6):
+        n = max(0, min(count, self.capacity - self.count))
+        self.hits += n
+        self.misses += count - n
+        if not n:
+            return
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.px[s] = x
+        self.y[s] = self.py[s] = y
+        self.vx[s] = self.rng.uniform(-90, 90, n)
+        self.vy[s] = self.rng.uniform(-140, 140, n)
+        self.life[s] = lifespan
+        self.color[s] = self._sprite_for(color)
+        self.count += n
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.life[:n] -= dt
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        self.x[:n] += np.trunc(self.vx[:n] * dt)
+        self.y[:n] += np.trunc(self.vy[:n] * dt)
+        keep = self.life[:n] > 0
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[:n][keep]
+        self.count = k
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "free": self.capacity - self.count}
+
+    def empty(self):
+        self.count = 0
+
+    def draw(self, surface, alpha=1.0, dirty=False):
+        n = self.count
+        if not n:
+            return []
+        half = self.size // 2
+        px = self.px[:n]
+        py = self.py[:n]
+        xs = (px + (self.x[:n] - px) * alpha - half).astype(np.int32).tolist()
+        ys = (py + (self.y[:n] - py) * alpha - half).astype(np.int32).tolist()
+        sprites = self.sprites
+        return surface.blits([(sprites[c], (x, y)) for c, x, y in zip(self.color[:n].tolist(), xs, ys)], dirty)
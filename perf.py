@@ -0,0 +1,139 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from utils import load_font
+
+
+class StageTimer:
+    def __init__(self):
+        self.frame = {}
+        self.stack = []
+        self.mark = 0.0
+        self.start = time.perf_counter()
+        self.listeners = []
+
+    def _charge(self, name, now):
+        self.frame[name] = self.frame.get(name, 0.0) + now - self.mark
+
+    def push(self, name):
+        now = time.perf_counter()
+        if self.stack:
+            self._charge(self.stack[-1], now)
+        self.stack.append(name)
+        self.mark = now
+
+    def pop(self):
+        now = time.perf_counter()
+        self._charge(self.stack.pop(), now)
+        self.mark = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        record, self.frame = self.frame, {}
+        record["frame"] = now - self.start
+        self.start = now
+        for listener in self.listeners:
+            listener(record)
+        return record
+
+
+STAGES = ("update", "collisions", "draw", "scanlines", "overlay", "flip")
+
+
+class FrameCsv:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="", buffering=1)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(("frame", "total_ms") + tuple(f"{stage}_ms" for stage in STAGES))
+        self.count = 0
+
+    def __call__(self, record):
+        row = [self.count, f"{record.get('frame', 0.0) * 1000:.3f}"]
+        row.extend(f"{record.get(stage, 0.0) * 1000:.3f}" for stage in STAGES)
+        self.writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+class PerfOverlay:
+    WIDTH = 220
+    GRAPH_H = 48
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, timer, history=120, refresh=15):
+        self.visible = False
+        self.history = deque(maxlen=history)
+        self.refresh = refresh
+        self.font = load_font(14)
+        self.lines = []
+        self.panel = None
+        self.counter = 0
+        timer.listeners.append(self.history.append)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.counter = 0
+
+    def _text(self, counts):
+        records = self.history
+        n = max(1, len(records))
+        frame_ms = sum(r.get("frame", 0.0) for r in records) * 1000 / n
+        worst_ms = max((r.get("frame", 0.0) for r in records), default=0.0) * 1000
+        lines = [f"frame {frame_ms:5.2f} ms  max {worst_ms:5.2f}"]
+        for stage in STAGES:
+            lines.append(f"{stage:<11}{sum(r.get(stage, 0.0) for r in records) * 1000 / n:6.2f} ms")
+        lines.append(" ".join(f"{name}:{count}" for name, count in counts.items()))
+        return [self.font.render(line, True, (200, 255, 200)) for line in lines]
+
+    def draw(self, surface, counts):
+        if self.counter == 0:
+            self.lines = self._text(counts)
+        self.counter = (self.counter + 1) % self.refresh
+
+        line_h = self.font.get_linesize()
+        width = max([self.WIDTH] + [line.get_width() + 12 for line in self.lines])
+        height = len(self.lines) * line_h + self.GRAPH_H + 16
+        x = surface.get_width() - width - 8
+        y = 56
+        if self.panel is None or self.panel.get_size() != (width, height):
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+        surface.blit(self.panel, (x, y))
+        surface.blits([(line, (x + 6, y + 4 + i * line_h)) for i, line in enumerate(self.lines)], False)
+
+        gx = x + 6
+        gy = y + height - 6
+        scale = self.GRAPH_H / (self.BUDGET_MS * 2)
+        pygame.draw.line(surface, (90, 90, 140), (gx, gy - self.BUDGET_MS * scale), (x + width - 6, gy - self.BUDGET_MS * scale))
+        step = (width - 12) / self.history.maxlen
+        for i, record in enumerate(self.history):
+            ms = record.get("frame", 0.0) * 1000
+            color = (120, 220, 120) if ms <= self.BUDGET_MS * 1.1 else (240, 90, 70)
+            top = gy - min(self.GRAPH_H, ms * scale)
+            pygame.draw.line(surface, color, (gx + i * step, gy), (gx + i * step, top))
+        return pygame.Rect(x, y, width, height)
+
+
+class PhaseTimer:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = []
+        total = 0.0
+        for name, seconds in self.phases:
+            total += seconds
+            lines.append(f"  {name:<16}{seconds * 1000:8.1f} ms  {total * 1000:8.1f} ms")
+        return "\n".join(lines)
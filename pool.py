@@ -0,0 +1,45 @@
+import pygame
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+    pooled = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class SpritePool:
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            sprite = self.factory(*args, **kwargs)
+            sprite.pool = self
+            self.misses += 1
+        sprite.pooled = False
+        return sprite
+
+    def release(self, sprite):
+        if sprite.pooled:
+            return
+        sprite.pooled = True
+        self.free.append(sprite)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "free": len(self.free)}
+
+
+def kill_all(group):
+    for sprite in group.sprites():
+        sprite.kill()
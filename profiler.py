@@ -0,0 +1,45 @@
+import os
+import sys
+import threading
+
+
+class SamplingProfiler:
+    def __init__(self, path, bucket, interval=0.005):
+        self.path = path
+        self.bucket = bucket
+        self.interval = interval
+        self.counts = {}
+        self.samples = 0
+        self.target = threading.main_thread().ident
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _frame_label(self, frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample_loop(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.append(self.bucket())
+            key = ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        with open(self.path, "w", encoding="utf-8") as f:
+            for key, count in sorted(self.counts.items()):
+                f.write(f"{key} {count}\n")
+        return self.samples
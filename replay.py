@@ -0,0 +1,152 @@
+import time
+import struct
+import zlib
+import pygame
+
+from game import Game
+from headless import KeyState
+
+KEYS = (
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_UP,
+    pygame.K_DOWN,
+    pygame.K_SPACE,
+    pygame.K_p,
+    pygame.K_RETURN,
+    pygame.K_ESCAPE,
+)
+KEY_INDEX = {key: i for i, key in enumerate(KEYS)}
+
+MAGIC = b"GFRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHQBBI")
+HASH = struct.Struct("<I")
+FLAG_HASHES = 1
+FLAG_BOSS = 2
+
+
+def state_hash(game):
+    crc = zlib.crc32(game.state.encode())
+    crc = zlib.crc32(struct.pack("<diid", game.sim_time, game.score, game.level, game.level_time), crc)
+    p = game.player
+    crc = zlib.crc32(struct.pack("<4iiddd", *p.rect, p.lives, p.shield, p.triple_shot, p.invuln), crc)
+    enemies = game.enemies
+    n = len(enemies.members)
+    crc = zlib.crc32(enemies.data[:n, :2].tobytes(), crc)
+    crc = zlib.crc32(struct.pack(f"<{n}d", *(e.hp for e in enemies.members)), crc)
+    for field in (game.player_bullets, game.enemy_bullets):
+        crc = zlib.crc32(field.x[: field.count].tobytes(), crc)
+        crc = zlib.crc32(field.y[: field.count].tobytes(), crc)
+        crc = zlib.crc32(field.alive[: field.count].tobytes(), crc)
+    boss = game.boss_group.sprite
+    if boss:
+        crc = zlib.crc32(struct.pack("<4id", *boss.rect, boss.hp), crc)
+    for group in (game.asteroids, game.powerups):
+        for sprite in group:
+            crc = zlib.crc32(struct.pack("<4i", *sprite.rect), crc)
+    return crc
+
+
+class ReplayRecorder:
+    def __init__(self, path, hashes=False):
+        self.path = path
+        self.hashes = hashes
+        self.active = False
+        self.done = False
+        self.seed = 0
+        self.level = 1
+        self.boss = False
+        self.ticks = 0
+        self.body = bytearray()
+
+    def begin(self, seed, level, boss=False):
+        if self.active or self.done:
+            return
+        self.active = True
+        self.seed = seed
+        self.level = level
+        self.boss = boss
+
+    def record(self, keys, pressed, game):
+        held = 0
+        if keys is not None:
+            for i, key in enumerate(KEYS):
+                if keys[key]:
+                    held |= 1 << i
+        codes = [KEY_INDEX[key] for key in pressed if key in KEY_INDEX]
+        self.body.append(held)
+        self.body.append(len(codes))
+        self.body.extend(codes)
+        if self.hashes:
+            self.body += HASH.pack(state_hash(game))
+        self.ticks += 1
+
+    def finish(self):
+        if not self.active:
+            return
+        self.active = False
+        self.done = True
+        flags = (FLAG_HASHES if self.hashes else 0) | (FLAG_BOSS if self.boss else 0)
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.level, flags, self.ticks)
+        body = zlib.compress(bytes(self.body), 9)
+        with open(self.path, "wb") as f:
+            f.write(header)
+            f.write(body)
+
+
+class Replay:
+    def __init__(self, seed, level, boss, frames):
+        self.seed = seed
+        self.level = level
+        self.boss = boss
+        self.frames = frames
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, level, flags, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        body = zlib.decompress(data[HEADER.size :])
+        frames = []
+        pos = 0
+        for _ in range(ticks):
+            held = body[pos]
+            count = body[pos + 1]
+            pos += 2
+            pressed = [KEYS[code] for code in body[pos : pos + count]]
+            pos += count
+            expected = None
+            if flags & FLAG_HASHES:
+                expected = HASH.unpack_from(body, pos)[0]
+                pos += HASH.size
+            keys = [key for i, key in enumerate(KEYS) if held & (1 << i)]
+            frames.append((keys, pressed, expected))
+        return cls(seed, level, bool(flags & FLAG_BOSS), frames)
+
+
+def play(replay, verify=True):
+    game = Game(headless=True)
+    game.reset_game(replay.level, replay.seed, boss=replay.boss)
+    divergence = None
+    tick = 0
+    began = time.perf_counter()
+    for held, pressed, expected in replay.frames:
+        game.step(KeyState(held), pressed)
+        if verify and expected is not None:
+            actual = state_hash(game)
+            if actual != expected:
+                divergence = {"tick": tick, "expected": expected, "actual": actual}
+                break
+        tick += 1
+    elapsed = time.perf_counter() - began
+    return {
+        "ticks": tick,
+        "elapsed": elapsed,
+        "ticks_per_second": tick / elapsed if elapsed > 0 else 0.0,
+        "state": game.state,
+        "score": game.score,
+        "divergence": divergence,
+    }
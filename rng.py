@@ -0,0 +1,26 @@
+import os
+import hashlib
+import random
+import numpy as np
+
+
+class RngStreams:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed & 0xFFFFFFFFFFFFFFFF
+        self.streams = {}
+
+    def derive(self, name):
+        digest = hashlib.sha256(f"{self.seed}:{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "little")
+
+    def stream(self, name):
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = random.Random(self.derive(name))
+            self.streams[name] = rng
+        return rng
+
+    def numpy(self, name):
+        return np.random.default_rng(self.derive(name))
@@ -0,0 +1,29 @@
+import pygame
+
+FRAMES = 32
+
+
+class RotationCache:
+    def __init__(self, count=FRAMES):
+        self.count = count
+        self.sets = {}
+
+    def frames(self, key, image, canvas=None):
+        frames = self.sets.get(key)
+        if frames is None:
+            frames = [self._rotate(image, 360 * i / self.count, canvas) for i in range(self.count)]
+            self.sets[key] = frames
+        return frames
+
+    def _rotate(self, image, angle, canvas):
+        rotated = pygame.transform.rotozoom(image, angle, 1) if angle else image
+        if canvas is not None:
+            frame = pygame.Surface(canvas, pygame.SRCALPHA)
+            frame.blit(rotated, rotated.get_rect(center=(canvas[0] // 2, canvas[1] // 2)))
+            rotated = frame
+        if pygame.display.get_surface():
+            rotated = rotated.convert_alpha()
+        return rotated
+
+
+rotations = RotationCache()
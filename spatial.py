@@ -0,0 +1,45 @@
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item, rect):
+        cs = self.cell_size
+        cells = self.cells
+        y0 = rect.top // cs
+        y1 = (rect.bottom - 1) // cs + 1
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(y0, y1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def insert_group(self, group):
+        for sprite in group:
+            self.insert(sprite, sprite.rect)
+
+    def query(self, rect):
+        cs = self.cell_size
+        cells = self.cells
+        x0 = rect.left // cs
+        x1 = (rect.right - 1) // cs
+        y0 = rect.top // cs
+        y1 = (rect.bottom - 1) // cs
+        if x0 == x1 and y0 == y1:
+            bucket = cells.get((x0, y0))
+            if not bucket:
+                return []
+            return [item for item in bucket if item.rect.colliderect(rect)]
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for item in bucket:
+                        found[item] = None
+        return [item for item in found if item.rect.colliderect(rect)]
@@ -1,18 +1,9 @@
-import os
-import pygame
-
-from config import ASSET_DIR
+from assets import assets
 from utils import sprite_from_map
 
 
 def _load_png(name):
-    path = os.path.join(ASSET_DIR, name)
-    if os.path.exists(path):
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception:
-            return None
-    return None
+    return assets.image(name)
 
 
 class SpriteFactory:
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+import pygame
+
+from config import HEIGHT
+from rotation import rotations
+
+FIELDS = ("x", "y", "prev_x", "prev_y", "half_w", "half_h", "age", "speed", "start_x", "offset", "amp", "freq", "phase", "vx", "delay", "heading")
+X, Y, PREV_X, PREV_Y, HALF_W, HALF_H, AGE, SPEED, START_X, OFFSET, AMP, FREQ, PHASE, VX, DELAY, HEADING = range(len(FIELDS))
+
+STRAIGHT, HOMING, SINE, DRIFT, STAGGER, SWAY = range(6)
+
+SINE_PATTERNS = {
+    "arc": (120, 1.2),
+    "zig": (140, 2.4),
+    "escort_lead": (20, 1.2),
+    "escort_wing": (15, 1.5),
+}
+
+
+def _straight(d, i, dt, env):
+    d[i, Y] += np.trunc(d[i, SPEED] * dt)
+
+
+def _homing(d, i, dt, env):
+    px, py, _ = env
+    dx = px - (d[i, X] + d[i, HALF_W])
+    dy = py - (d[i, Y] + d[i, HALF_H])
+    dist = np.maximum(1, np.hypot(dx, dy))
+    step = d[i, SPEED] * 1.05 * dt
+    d[i, X] += np.trunc((dx / dist) * step)
+    d[i, Y] += np.trunc((dy / dist) * step)
+    vx = d[i, X] - d[i, PREV_X]
+    vy = d[i, Y] - d[i, PREV_Y]
+    moving = (vx != 0) | (vy != 0)
+    d[i[moving], HEADING] = np.arctan2(vx[moving], vy[moving])
+
+
+def _sine(d, i, dt, env):
+    d[i, Y] += np.trunc(d[i, SPEED] * dt)
+    d[i, X] = np.trunc(d[i, START_X] + d[i, OFFSET] + np.sin(d[i, AGE] * d[i, FREQ] + d[i, PHASE]) * d[i, AMP])
+
+
+def _drift(d, i, dt, env):
+    d[i, Y] += np.trunc(d[i, SPEED] * dt)
+    d[i, X] += np.trunc(d[i, VX] * dt)
+
+
+def _stagger(d, i, dt, env):
+    speed_mul = np.where(d[i, AGE] < d[i, DELAY], 0.3, 1.0)
+    d[i, Y] += np.trunc(d[i, SPEED] * speed_mul * dt)
+
+
+def _sway(d, i, dt, env):
+    t = env[2]
+    d[i, Y] += np.trunc(d[i, SPEED] * 0.6 * dt)
+    d[i, X] += np.trunc(np.sin(t / 0.18 + d[i, PHASE]) * 60 * dt)
+
+
+KERNELS = (
+    (STRAIGHT, _straight),
+    (HOMING, _homing),
+    (SINE, _sine),
+    (DRIFT, _drift),
+    (STAGGER, _stagger),
+    (SWAY, _sway),
+)
+
+
+def heading_frames(etype, image):
+    return rotations.frames(("enemy", etype), image)
+
+
+class EnemySquadron(pygame.sprite.Group):
+    def __init__(self, capacity=64):
+        self.members = []
+        self.capacity = capacity
+        self.data = np.zeros((capacity, len(FIELDS)))
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        super().__init__()
+
+    def _grow(self, needed):
+        capacity = max(needed, self.capacity * 2)
+        data = np.zeros((capacity, len(FIELDS)))
+        data[: self.capacity] = self.data
+        kind = np.zeros(capacity, dtype=np.int8)
+        kind[: self.capacity] = self.kind
+        self.data = data
+        self.kind = kind
+        self.capacity = capacity
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        i = len(self.members)
+        if i == self.capacity:
+            self._grow(i + 1)
+        sprite.slot = i
+        self.members.append(sprite)
+        self._load(i, sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        i = sprite.slot
+        last = len(self.members) - 1
+        moved = self.members.pop()
+        if i != last:
+            self.members[i] = moved
+            moved.slot = i
+            self.data[i] = self.data[last]
+            self.kind[i] = self.kind[last]
+
+    def _load(self, i, enemy):
+        rect = enemy.rect
+        data = enemy.pattern_data
+        pattern = enemy.pattern
+        row = self.data[i]
+        row[:] = 0
+        row[X] = row[PREV_X] = rect.x
+        row[Y] = row[PREV_Y] = rect.y
+        row[HALF_W] = rect.width // 2
+        row[HALF_H] = rect.height // 2
+        row[SPEED] = enemy.speed
+        if enemy.kamikaze:
+            kind = HOMING
+        elif pattern in SINE_PATTERNS:
+            amp, freq = SINE_PATTERNS[pattern]
+            kind = SINE
+            row[START_X] = data.get("start_x", rect.x)
+            row[OFFSET] = data.get("offset", 0)
+            row[AMP] = data.get("amp", amp)
+            row[FREQ] = data.get("freq", freq)
+            row[PHASE] = data.get("phase", 0.0)
+        elif pattern == "v":
+            kind = DRIFT
+            row[VX] = data.get("direction", 1) * data.get("vx", 90)
+        elif pattern == "stagger":
+            kind = STAGGER
+            row[DELAY] = data.get("delay", 0.0)
+        elif enemy.etype == "shielded":
+            kind = SWAY
+            row[PHASE] = enemy.zig_phase
+        else:
+            kind = STRAIGHT
+        self.kind[i] = kind
+
+    def update(self, dt, player, t):
+        n = len(self.members)
+        if not n:
+            return
+        d = self.data
+        d[:n, PREV_X] = d[:n, X]
+        d[:n, PREV_Y] = d[:n, Y]
+        d[:n, AGE] += dt
+        env = (player.rect.centerx, player.rect.centery, t)
+        kind = self.kind[:n]
+        for k, kernel in KERNELS:
+            i = np.flatnonzero(kind == k)
+            if len(i):
+                kernel(d, i, dt, env)
+
+        xs = d[:n, X].astype(np.int32).tolist()
+        ys = d[:n, Y].astype(np.int32).tolist()
+        for sprite, x, y in zip(self.members, xs, ys):
+            sprite.rect.topleft = (x, y)
+
+        gone = np.flatnonzero(d[:n, Y] > HEIGHT + 40)
+        if len(gone):
+            for sprite in [self.members[i] for i in gone.tolist()]:
+                sprite.kill()
+
+    def draw(self, surface, alpha=1.0, dirty=False):
+        n = len(self.members)
+        if not n:
+            return []
+        d = self.data
+        xs = (d[:n, PREV_X] + (d[:n, X] - d[:n, PREV_X]) * alpha).astype(np.int32).tolist()
+        ys = (d[:n, PREV_Y] + (d[:n, Y] - d[:n, PREV_Y]) * alpha).astype(np.int32).tolist()
+        blits = [(sprite.image, pos) for sprite, pos in zip(self.members, zip(xs, ys))]
+        homing = np.flatnonzero(self.kind[:n] == HOMING)
+        if len(homing):
+            steps = (np.rint(d[homing, HEADING] * rotations.count / math.tau) % rotations.count).astype(np.int32).tolist()
+            for i, step in zip(homing.tolist(), steps):
+                sprite = self.members[i]
+                frame = heading_frames(sprite.etype, sprite.image)[step]
+                w, h = sprite.rect.size
+                blits[i] = (frame, (xs[i] + (w - frame.get_width()) // 2, ys[i] + (h - frame.get_height()) // 2))
+        return surface.blits(blits, dirty)
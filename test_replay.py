@@ -0,0 +1,37 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game import Game
+from headless import KeyState
+from replay import Replay, ReplayRecorder, play
+
+
+def record(path, start_state, ticks=240):
+    game = Game(headless=True, seed=11)
+    game.recorder = ReplayRecorder(path, hashes=True)
+    game.state = start_state
+    pressed = [pygame.K_RETURN] if start_state == "MENU" else []
+    for tick in range(ticks):
+        held = (pygame.K_SPACE, pygame.K_LEFT) if tick % 40 < 20 else (pygame.K_SPACE,)
+        game.step(KeyState(held), pressed)
+        pressed = []
+    game.recorder.finish()
+    return Replay.load(path)
+
+
+def test_replay_round_trip_from_menu(tmp_path):
+    replay = record(str(tmp_path / "menu.gfr"), "MENU")
+    result = play(replay)
+    assert result["divergence"] is None
+    assert result["ticks"] == len(replay.frames) > 0
+
+
+def test_replay_round_trip_through_loading(tmp_path):
+    replay = record(str(tmp_path / "loading.gfr"), "LOADING")
+    result = play(replay)
+    assert result["divergence"] is None
+    assert result["ticks"] == len(replay.frames) > 0
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+
+class DigitAtlas:
+    def __init__(self, font, color, chars="0123456789"):
+        self.glyphs = {ch: font.render(ch, True, color) for ch in chars}
+        self.advance = {ch: glyph.get_width() for ch, glyph in self.glyphs.items()}
+        self.height = font.get_height()
+
+    def draw(self, surface, value, pos):
+        x, y = pos
+        glyphs = self.glyphs
+        advance = self.advance
+        seq = []
+        for ch in str(value):
+            seq.append((glyphs[ch], (x, y)))
+            x += advance[ch]
+        surface.blits(seq, False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
@@ -1,8 +1,11 @@
-import math
-from array import array
+import os
+import json
+import hashlib
+from functools import lru_cache
 import pygame
+import numpy as np
 
-from config import HISCORE_FILE
+from config import HISCORE_FILE, FONT_CACHE_FILE, FONT_NAMES, SYNTH_CACHE_DIR
 
 
 def clamp(val, minv, maxv):
@@ -22,6 +25,41 @@ def sprite_from_map(map_data, palette, scale=3):
     return surf
 
 
+def load_image(path, alpha=True):
+    if not os.path.exists(path):
+        return None
+    try:
+        img = pygame.image.load(path)
+    except Exception:
+        return None
+    if not pygame.display.get_surface():
+        return img
+    return img.convert_alpha() if alpha else img.convert()
+
+
+@lru_cache(maxsize=None)
+def resolve_font(names=FONT_NAMES):
+    try:
+        with open(FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["names"] == names and (cached["path"] is None or os.path.exists(cached["path"])):
+            return cached["path"]
+    except Exception:
+        pass
+    path = pygame.font.match_font(names)
+    try:
+        with open(FONT_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"names": names, "path": path}, f)
+    except Exception:
+        pass
+    return path
+
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    return pygame.font.Font(resolve_font(), size)
+
+
 def read_hiscore():
     try:
         with open(HISCORE_FILE, "r", encoding="utf-8") as f:
@@ -38,41 +76,43 @@ def write_hiscore(score):
         pass
 
 
+_pcm_cache = {}
+
+
+def cached_pcm(kind, params, build):
+    key = json.dumps([kind, params])
+    pcm = _pcm_cache.get(key)
+    if pcm is not None:
+        return pcm
+    path = os.path.join(SYNTH_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+    try:
+        pcm = np.load(path)
+    except Exception:
+        pcm = build().astype(np.int16)
+        try:
+            os.makedirs(SYNTH_CACHE_DIR, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, pcm)
+            os.replace(path + ".tmp", path)
+        except Exception:
+            pass
+    _pcm_cache[key] = pcm
+    return pcm
+
+
+def wave(freq, t, waveform="sine"):
+    phase = 2 * np.pi * freq * t
+    if waveform == "triangle":
+        return 2.0 * np.abs(2 * (t * freq - np.floor(t * freq + 0.5))) - 1.0
+    if waveform == "square":
+        return np.where(np.sin(phase) >= 0, 1.0, -1.0)
+    return np.sin(phase)
+
+
 def make_beep(freq, duration=0.12, volume=0.5, waveform="sine", sample_rate=22050):
-    n = int(duration * sample_rate)
-    buf = array("h")
-    amp = int(32767 * volume)
-    for i in range(n):
-        t = i / sample_rate
-        val = math.sin(2 * math.pi * freq * t)
-        if waveform == "triangle":
-            val = 2.0 * abs(2 * (t * freq - math.floor(t * freq + 0.5))) - 1.0
-        if waveform == "square":
-            val = 1.0 if math.sin(2 * math.pi * freq * t) >= 0 else -1.0
-        env = 1.0
-        if t < 0.01:
-            env = t / 0.01
-        elif t > duration - 0.04:
-            env = max(0.0, (duration - t) / 0.04)
-        val *= env
-        buf.append(int(val * amp))
-    return pygame.mixer.Sound(buffer=buf)
-
-
-def make_melody(sequence, bpm=120, volume=0.25, sample_rate=22050, waveform="sine"):
-    beat = 60 / bpm
-    buf = array("h")
-    amp = int(32767 * volume)
-    for freq, beats in sequence:
-        n = int(beat * beats * sample_rate)
-        for i in range(n):
-            if freq == 0:
-                buf.append(0)
-                continue
-            t = i / sample_rate
-            if waveform == "square":
-                val = 1.0 if math.sin(2 * math.pi * freq * t) >= 0 else -1.0
-            else:
-                val = math.sin(2 * math.pi * freq * t)
-            buf.append(int(val * amp))
-    return pygame.mixer.Sound(buffer=buf)
+    def build():
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        env = np.where(t < 0.01, t / 0.01, np.where(t > duration - 0.04, np.maximum(0.0, (duration - t) / 0.04), 1.0))
+        return wave(freq, t, waveform) * env * int(32767 * volume)
+
+    return pygame.mixer.Sound(buffer=cached_pcm("beep", [freq, duration, volume, waveform, sample_rate], build))